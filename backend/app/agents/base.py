@@ -0,0 +1,192 @@
+from crewai import Agent, Task, Crew
+from app.core.agent_pool import agent_pool, AgentPoolFullError
+from app.core.agent_cache import agent_cache
+from app.agents.fast_path import fast_path
+from app.agents.crew_pool import CrewTemplatePool, PooledCrew
+from typing import Dict, Any, AsyncIterator, Callable, Tuple
+import asyncio
+import json
+
+# How much of a tool result is forwarded in a progress event
+STEP_RESULT_PREVIEW = 2000
+
+# Idle seconds before a ping event keeps proxies from closing the stream
+STREAM_KEEPALIVE_SECONDS = 15
+
+class CrewAgent:
+    """Common query handling for the CrewAI-backed agents.
+
+    Subclasses implement ``_build_agent`` and ``_build_task``; their crews
+    are kept in a template pool and reused across requests. Crew runs are
+    blocking, so they are dispatched to the shared agent worker pool and
+    the event loop stays free for the rest of the API. Well-known questions
+    are answered by the fast path without an LLM, and answers to other
+    read-only questions are served from the agent answer cache when possible.
+    """
+
+    name: str = "agent"
+
+    def __init__(self):
+        self.crew_pool = CrewTemplatePool(self._build_crew)
+        self.crew_pool.prewarm(1)
+
+    async def process_query(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Process a query by running the crew on the agent worker pool"""
+        try:
+            answer = await fast_path.answer(self.name, query)
+            if answer is not None:
+                return answer
+
+            cache_key, cached = self._cache_lookup(query, context)
+            if cached is not None:
+                fast_path.record(self.name, "cache")
+                return {
+                    "status": "success",
+                    "response": cached,
+                    "agent": self.name,
+                    "query": query,
+                    "cached": True
+                }
+
+            store = self._cache_store(cache_key, query)
+            result = await agent_pool.run(self._run_crew, query, context)
+            fast_path.record(self.name, "crew")
+            store(result)
+
+            return {
+                "status": "success",
+                "response": result,
+                "agent": self.name,
+                "query": query
+            }
+
+        except AgentPoolFullError:
+            # Let the API layer turn this into a 503 instead of an error payload
+            raise
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e),
+                "agent": self.name,
+                "query": query
+            }
+
+    async def stream_query(self, query: str, context: Dict[str, Any] = None) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Start a crew run and return an iterator of (event, data) progress events.
+
+        The crew is queued before this returns, so ``AgentPoolFullError`` is
+        raised up front rather than halfway through a stream. Events are
+        ``step`` and ``tool`` while the agent works (plus ``ping`` when idle),
+        then ``answer`` or ``error``.
+        """
+        answer = await fast_path.answer(self.name, query)
+        if answer is None:
+            cache_key, cached = self._cache_lookup(query, context)
+            if cached is not None:
+                fast_path.record(self.name, "cache")
+                answer = {"agent": self.name, "query": query, "response": cached, "cached": True}
+
+        if answer is not None:
+            async def replay():
+                yield "start", {"agent": self.name, "query": query}
+                yield "answer", answer
+            return replay()
+
+        store = self._cache_store(cache_key, query)
+        loop = asyncio.get_running_loop()
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_step(step):
+            # Called on the pool thread, hand the event over to the loop
+            loop.call_soon_threadsafe(events.put_nowait, describe_step(step))
+
+        run = agent_pool.submit(self._run_crew, query, context, on_step)
+        run.add_done_callback(lambda _: events.put_nowait(None))
+
+        async def iterate():
+            yield "start", {"agent": self.name, "query": query}
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.get(), STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield "ping", {}
+                    continue
+                if event is None:
+                    break
+                yield event
+
+            try:
+                result = run.result()
+                fast_path.record(self.name, "crew")
+                store(result)
+                yield "answer", {"agent": self.name, "query": query, "response": result}
+            except Exception as e:
+                yield "error", {"agent": self.name, "query": query, "error": str(e)}
+
+        return iterate()
+
+    def _cache_lookup(self, query: str, context: Dict[str, Any] = None):
+        """Return (key, cached answer); the key is None for uncacheable queries"""
+        if not agent_cache.is_cacheable(query):
+            return None, None
+        key = agent_cache.make_key(self.name, query, context)
+        return key, agent_cache.get(key)
+
+    def _cache_store(self, key: str, query: str) -> Callable[[Any], None]:
+        """Capture write versions now and return a callback that caches the answer"""
+        if key is None:
+            return lambda result: None
+        deps = agent_cache.dependencies_for(query)
+        versions = agent_cache.versions(deps)
+        return lambda result: agent_cache.set(key, result, deps, versions)
+
+    def _run_crew(self, query: str, context: Dict[str, Any] = None, step_callback: Callable[[Any], None] = None):
+        """Run a pooled crew for the query (blocking, runs on a pool thread)"""
+        inputs = {"query": query, "context": json.dumps(context or {}, default=str)}
+
+        with self.crew_pool.checkout(step_callback) as pooled:
+            result = pooled.crew.kickoff(inputs=inputs)
+
+        # Plain text keeps the result JSON- and BSON-friendly for jobs and clients
+        return str(result)
+
+    def _build_crew(self) -> PooledCrew:
+        agent = self._build_agent()
+        task = self._build_task(agent)
+
+        crew = Crew(
+            agents=[agent],
+            tasks=[task],
+            verbose=True,
+            # CrewAI's tool result cache would serve stale data to later requests
+            cache=False
+        )
+
+        return PooledCrew(agent, task, crew)
+
+    def _build_agent(self) -> Agent:
+        raise NotImplementedError
+
+    def _build_task(self, agent: Agent) -> Task:
+        """Task template with {query} and {context} placeholders"""
+        raise NotImplementedError
+
+def describe_step(step: Any) -> Tuple[str, Dict[str, Any]]:
+    """Turn a CrewAI step callback payload into a progress event"""
+    thought = getattr(step, "thought", None)
+
+    if getattr(step, "tool", None):
+        # AgentAction: the agent picked a tool, result is filled in once it ran
+        result = getattr(step, "result", None)
+        return "tool", {
+            "thought": thought,
+            "tool": step.tool,
+            "input": getattr(step, "tool_input", None),
+            "result": str(result)[:STEP_RESULT_PREVIEW] if result is not None else None
+        }
+
+    if hasattr(step, "output"):
+        # AgentFinish: the agent settled on its answer for the task
+        return "step", {"thought": thought, "output": str(step.output)}
+
+    return "step", {"text": str(getattr(step, "text", step))}
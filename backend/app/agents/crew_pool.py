@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from crewai import Agent, Task, Crew
+from typing import Dict, Any, Callable, Iterator
+import queue
+import threading
+
+class PooledCrew:
+    """A pre-built agent, task template and crew that serve one request at a time"""
+
+    def __init__(self, agent: Agent, task: Task, crew: Crew):
+        self.agent = agent
+        self.task = task
+        self.crew = crew
+
+class CrewTemplatePool:
+    """Pool of isolated agent+crew instances for one agent type.
+
+    Building a CrewAI Agent, Task and Crew for every request is wasted work,
+    and sharing one Agent across parallel crew runs is not safe. Requests
+    check out an instance, run it with their own inputs and return it.
+    Instances are built on demand, so the pool never holds more than the
+    highest number of runs that were in flight at once (at most the agent
+    worker pool size).
+    """
+
+    def __init__(self, factory: Callable[[], PooledCrew]):
+        self._factory = factory
+        self._idle: "queue.LifoQueue[PooledCrew]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checkouts = 0
+        self._reused = 0
+
+    def prewarm(self, count: int):
+        """Build instances up front so the first requests skip setup"""
+        for _ in range(count):
+            self._idle.put(self._build())
+
+    def _build(self) -> PooledCrew:
+        pooled = self._factory()
+        with self._lock:
+            self._created += 1
+        return pooled
+
+    @contextmanager
+    def checkout(self, step_callback: Callable[[Any], None] = None) -> Iterator[PooledCrew]:
+        try:
+            pooled = self._idle.get_nowait()
+            reused = True
+        except queue.Empty:
+            pooled = self._build()
+            reused = False
+
+        with self._lock:
+            self._checkouts += 1
+            self._reused += reused
+
+        pooled.agent.step_callback = step_callback
+        try:
+            yield pooled
+        finally:
+            # Never let one request's progress callback leak into the next
+            pooled.agent.step_callback = None
+            self._idle.put(pooled)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "checkouts": self._checkouts,
+                "reused": self._reused
+            }
@@ -1,74 +1,49 @@
-from crewai import Agent, Task, Crew
+from crewai import Agent, Task
+from app.agents.base import CrewAgent
+from app.agents.llm import build_llm
 from app.tools.mongodb_tool import MongoDBTool
 from typing import Dict, Any
-import asyncio
 
-class DashboardAgent:
-    def __init__(self):
-        self.mongodb_tool = MongoDBTool()
-        
-        # Define the dashboard agent with CrewAI
-        self.agent = Agent(
+class DashboardAgent(CrewAgent):
+    name = "dashboard"
+
+    def _build_agent(self) -> Agent:
+        """Build the CrewAI dashboard agent with its own tool instances"""
+        return Agent(
             role='Business Analytics Specialist',
             goal='Provide comprehensive business insights, analytics, and metrics to help business owners make data-driven decisions',
             backstory="""You are a skilled business analyst with expertise in fitness and wellness industry metrics.
             You have access to comprehensive business data including revenue, client information, course performance, and attendance records.
             Your role is to analyze data, identify trends, and provide actionable insights that help the business grow and improve client satisfaction.
             You excel at creating clear, understandable reports and highlighting key performance indicators.""",
-            tools=[self.mongodb_tool],
+            tools=[MongoDBTool()],
+            llm=build_llm(),
             verbose=True,
             allow_delegation=False,
             max_iter=3
         )
     
-    async def process_query(self, query: str, context: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Process an analytics query using the CrewAI agent"""
-        try:
-            # Create a task for the agent
-            task = Task(
-                description=f"""
-                Analyze the following business analytics query: {query}
-                
-                Context: {context or {}}
-                
-                You should:
-                1. Understand what business metric or insight is being requested
-                2. Use MongoDB aggregation queries to gather relevant data
-                3. Calculate appropriate metrics and KPIs
-                4. Identify trends and patterns in the data
-                5. Provide actionable insights and recommendations
-                6. Format the response with clear numbers, percentages, and explanations
-                
-                Focus on providing accurate, data-driven insights that help the business owner understand their performance.
-                """,
-                agent=self.agent,
-                expected_output="A comprehensive analytics report with relevant metrics, trends, and actionable business insights."
-            )
-            
-            # Create and run the crew
-            crew = Crew(
-                agents=[self.agent],
-                tasks=[task],
-                verbose=True
-            )
+    def _build_task(self, agent: Agent) -> Task:
+        """Build the analytics task template, filled in with {query} and {context} at kickoff"""
+        return Task(
+            description="""
+            Analyze the following business analytics query: {query}
             
-            # Execute the task
-            result = crew.kickoff()
+            Context: {context}
             
-            return {
-                "status": "success",
-                "response": result,
-                "agent": "dashboard",
-                "query": query
-            }
+            You should:
+            1. Understand what business metric or insight is being requested
+            2. Use MongoDB aggregation queries to gather relevant data
+            3. Calculate appropriate metrics and KPIs
+            4. Identify trends and patterns in the data
+            5. Provide actionable insights and recommendations
+            6. Format the response with clear numbers, percentages, and explanations
             
-        except Exception as e:
-            return {
-                "status": "error",
-                "error": str(e),
-                "agent": "dashboard", 
-                "query": query
-            }
+            Focus on providing accurate, data-driven insights that help the business owner understand their performance.
+            """,
+            agent=agent,
+            expected_output="A comprehensive analytics report with relevant metrics, trends, and actionable business insights."
+        )
     
     def get_capabilities(self) -> Dict[str, Any]:
         """Return the capabilities of the dashboard agent"""
@@ -0,0 +1,205 @@
+from app.core.agent_cache import AgentResponseCache
+from app.core.database import get_database
+from app.services.analytics import get_revenue_analytics, get_client_analytics, get_course_analytics, start_of_month
+from typing import Dict, Any, Optional, Callable, Awaitable, List, Tuple
+import logging
+import re
+import threading
+
+# Each intent is an anchored pattern on the normalized query and a handler
+# that answers it from the database. Anything else goes to the crew.
+Handler = Callable[[Any, "re.Match", str], Awaitable[Tuple[str, Dict[str, Any]]]]
+
+def _money(amount: float) -> str:
+    return f"₹{amount or 0:,.2f}"
+
+async def _revenue_this_month(db, match, query) -> Tuple[str, Dict[str, Any]]:
+    data = await get_revenue_analytics(db)
+    revenue = data["current_month_revenue"]
+    outstanding = data["outstanding_payments"]
+    text = (
+        f"We generated {_money(revenue['total_revenue'])} this month from "
+        f"{revenue['total_transactions']} completed transactions "
+        f"(average {_money(revenue['average_transaction'])}). "
+        f"Outstanding payments: {_money(outstanding['total_outstanding'])} across {outstanding['count']} pending payments."
+    )
+    return text, {
+        "total_revenue": revenue["total_revenue"],
+        "total_transactions": revenue["total_transactions"],
+        "average_transaction": revenue["average_transaction"],
+        "total_outstanding": outstanding["total_outstanding"],
+        "outstanding_count": outstanding["count"]
+    }
+
+async def _clients_by_status(db, match, query) -> Tuple[str, Dict[str, Any]]:
+    status = match.group("status")
+    count = await db.clients.count_documents({"status": status})
+    return f"We have {count} {status} clients.", {"status": status, "count": count}
+
+async def _new_clients_this_month(db, match, query) -> Tuple[str, Dict[str, Any]]:
+    data = await get_client_analytics(db)
+    count = data["new_clients_this_month"]
+    text = f"{count} new clients joined this month, out of {data['total_clients']} clients in total."
+    return text, {"new_clients_this_month": count, "total_clients": data["total_clients"]}
+
+async def _top_courses(db, match, query) -> Tuple[str, Dict[str, Any]]:
+    limit = int(match.group("limit") or 1)
+    courses = (await get_course_analytics(db))["course_performance"][:limit]
+    if not courses:
+        return "There are no courses with enrollments yet.", {"courses": []}
+
+    rows = [
+        {
+            "name": course.get("name"),
+            "instructor": course.get("instructor"),
+            "enrollment_count": course.get("enrollment_count", 0),
+            "total_revenue": course.get("total_revenue", 0)
+        }
+        for course in courses
+    ]
+    lines = [
+        f"{i}. {row['name']} ({row['instructor']}): {row['enrollment_count']} enrollments, {_money(row['total_revenue'])} revenue"
+        for i, row in enumerate(rows, start=1)
+    ]
+    heading = "Course with the highest enrollment:" if limit == 1 else f"Top {limit} courses by enrollment:"
+    return "\n".join([heading] + lines), {"courses": rows}
+
+async def _find_client_by_email(db, match, query) -> Tuple[str, Dict[str, Any]]:
+    # The match is on the lowercased query, email_lc makes the lookup case-insensitive
+    email = re.search(re.escape(match.group("email")), query, re.IGNORECASE).group(0)
+    client = await db.clients.find_one(
+        {"email_lc": email.lower()},
+        {"name": 1, "email": 1, "phone": 1, "status": 1, "created_at": 1}
+    )
+    if not client:
+        return f"No client found with email {email}.", {"client": None}
+
+    data = {
+        "id": str(client["_id"]),
+        "name": client.get("name"),
+        "email": client.get("email"),
+        "phone": client.get("phone"),
+        "status": client.get("status"),
+        "created_at": client["created_at"].isoformat() if client.get("created_at") else None
+    }
+    text = f"{data['name']} ({data['email']}, {data['phone']}), status: {data['status']}, client id {data['id']}."
+    return text, {"client": data}
+
+async def _pending_payments(db, match, query) -> Tuple[str, Dict[str, Any]]:
+    filter_query = {"status": "pending"}
+    if match.group("month"):
+        filter_query["payment_date"] = {"$gte": start_of_month()}
+    payments = await db.payments.find(
+        filter_query,
+        {"order_id": 1, "amount": 1, "payment_date": 1}
+    ).sort("payment_date", 1).limit(50).to_list(length=50)
+    total = await db.payments.count_documents(filter_query)
+    amount = sum(payment.get("amount", 0) for payment in payments)
+
+    rows = [
+        {
+            "payment_id": str(payment["_id"]),
+            "order_id": str(payment.get("order_id")),
+            "amount": payment.get("amount", 0),
+            "payment_date": payment["payment_date"].isoformat() if payment.get("payment_date") else None
+        }
+        for payment in payments
+    ]
+    text = f"There are {total} pending payments" + (" this month" if match.group("month") else "")
+    text += f"; the oldest {len(rows)} add up to {_money(amount)}." if total > len(rows) else f" totalling {_money(amount)}."
+    return text, {"count": total, "payments": rows}
+
+INTENTS: List[Tuple[str, "re.Pattern", Handler]] = [
+    (
+        "revenue_this_month",
+        re.compile(r"^(how much|what( is|'s| was)?( our| the)?( total)?) revenue( did we (generate|make|earn))?( for| in)? this month$"),
+        _revenue_this_month
+    ),
+    (
+        "clients_by_status",
+        re.compile(r"^how many (?P<status>active|inactive|suspended) (clients|customers|members) (do we have|are there)$"),
+        _clients_by_status
+    ),
+    (
+        "new_clients_this_month",
+        re.compile(r"^how many new (clients|customers|members) (joined|signed up|enrolled) this month$"),
+        _new_clients_this_month
+    ),
+    (
+        "top_courses",
+        re.compile(r"^(which course has the (highest|most) enrollments?|(show me |what are |list )?(the )?top (?P<limit>[1-9]\d?) courses( by enrollments?)?)$"),
+        _top_courses
+    ),
+    (
+        "find_client_by_email",
+        re.compile(r"^(find|look up|lookup|show|get)( the)? client (by|with) email (?P<email>[^\s@]+@[^\s@]+\.[a-z]{2,})$"),
+        _find_client_by_email
+    ),
+    (
+        "pending_payments",
+        re.compile(r"^(show( me)?|list|get)( all)? pending payments(?P<month>( for| from)? this month)?$"),
+        _pending_payments
+    )
+]
+
+class FastPathRouter:
+    """Answers common, well-defined queries straight from the database.
+
+    Matching is done with anchored patterns on the normalized query, so only
+    questions that mean exactly one thing are answered here. Also keeps the
+    per-agent split between fast path, cache and crew answers.
+    """
+
+    ROUTES = ("fast_path", "cache", "crew")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def match(self, query: str) -> Optional[Tuple[str, Handler, "re.Match"]]:
+        normalized = AgentResponseCache.normalize_query(query)
+        for name, pattern, handler in INTENTS:
+            match = pattern.match(normalized)
+            if match:
+                return name, handler, match
+        return None
+
+    async def answer(self, agent: str, query: str) -> Optional[Dict[str, Any]]:
+        """Answer the query if it matches an intent, otherwise return None"""
+        matched = self.match(query)
+        if not matched:
+            return None
+
+        name, handler, match = matched
+        try:
+            text, data = await handler(get_database(), match, query)
+        except Exception as e:
+            logging.warning(f"Fast path '{name}' failed, falling back to the crew: {e}")
+            return None
+
+        self.record(agent, "fast_path")
+        return {
+            "status": "success",
+            "response": text,
+            "agent": agent,
+            "query": query,
+            "route": "fast_path",
+            "intent": name,
+            "data": data
+        }
+
+    def record(self, agent: str, route: str):
+        with self._lock:
+            counts = self._counts.setdefault(agent, {name: 0 for name in self.ROUTES})
+            counts[route] += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = {}
+            for agent, counts in self._counts.items():
+                total = sum(counts.values())
+                metrics[agent] = dict(counts, total=total, fast_path_ratio=round(counts["fast_path"] / total, 3) if total else 0.0)
+            return metrics
+
+
+fast_path = FastPathRouter()
@@ -0,0 +1,44 @@
+from crewai import LLM
+from app.core.config import settings
+from app.core.llm_cache import completion_cache, CompletionCacheMiss, CACHE_OFF, CACHE_RECORD, CACHE_REPLAY
+from typing import Dict, Any
+
+# LLM attributes that change the completion and therefore belong in the key
+CACHE_KEY_PARAMS = (
+    "temperature", "top_p", "n", "stop", "max_tokens", "max_completion_tokens",
+    "presence_penalty", "frequency_penalty", "seed", "response_format"
+)
+
+class CachedLLM(LLM):
+    """CrewAI LLM that serves repeated prompts from the completion cache"""
+
+    def call(self, messages, *args, **kwargs):
+        cache = completion_cache
+        if cache.mode == CACHE_OFF:
+            return super().call(messages, *args, **kwargs)
+
+        key = cache.make_key(self.model, messages, self._cache_params(*args, **kwargs))
+
+        if cache.mode != CACHE_RECORD:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+            if cache.mode == CACHE_REPLAY:
+                raise CompletionCacheMiss(f"No recorded completion for this {self.model} prompt")
+
+        response = super().call(messages, *args, **kwargs)
+        # Tool-calling results can be arbitrary objects; only text is replayable
+        if isinstance(response, str):
+            cache.set(key, self.model, response)
+        return response
+
+    def _cache_params(self, *args, **kwargs) -> Dict[str, Any]:
+        params = {name: getattr(self, name, None) for name in CACHE_KEY_PARAMS}
+        tools = kwargs.get("tools", args[0] if args else None)
+        if tools:
+            params["tools"] = tools
+        return params
+
+def build_llm() -> LLM:
+    """LLM used by the agents, backed by the completion cache"""
+    return CachedLLM(model=settings.LLM_MODEL, api_key=settings.OPENAI_API_KEY)
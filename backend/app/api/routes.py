@@ -1,11 +1,38 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any, List, Optional
 from app.agents.support_agent import SupportAgent
 from app.agents.dashboard_agent import DashboardAgent
+from app.core.config import settings
 from app.core.database import get_database
+from app.core.agent_pool import agent_pool, AgentPoolFullError
+from app.core.agent_jobs import create_job, get_job
+from app.core.agent_cache import agent_cache
+from app.core.llm_cache import completion_cache
+from app.agents.fast_path import fast_path
+from app.core.loop_bridge import loop_bridge
+from app.core.response_cache import analytics_cache
+from app.core.pagination import fetch_page
+from app.core.fieldsets import resolve_projection, HIDDEN_FIELDS
+from app.core.responses import MongoJSONResponse
+from app.core.counts import count_cache, list_total
+from app.core.sequences import next_order_number, order_numbers
+from app.tools.result_formatter import compaction_stats
+from app.services.analytics import get_revenue_analytics as revenue_analytics, get_client_analytics as client_analytics, get_course_analytics as course_analytics
+from app.services.rollups import record_new_client, record_new_order, rebuild_rollups
+from app.services.rollup_scheduler import rollup_scheduler
+from app.services.bulk import bulk_create_clients, bulk_create_orders
+from app.services.exports import EXPORTS, FORMATS, parse_fields, stream_export
+from app.services.imports import KINDS as IMPORT_KINDS, Importer, read_rows
+from app.services.client_search import build_search_query, with_search_fields
+from app.services.course_catalog import course_catalog
 from app.models import *
 from datetime import datetime
 from bson import ObjectId
+import asyncio
+import io
+import json
+import os
 
 router = APIRouter()
 
@@ -14,9 +41,8 @@ support_agent = SupportAgent()
 dashboard_agent = DashboardAgent()
 
 # Agent endpoints
-@router.post("/agents/support/query")
-async def query_support_agent(query_data: Dict[str, Any]):
-    """Send a query to the Support Agent"""
+def _parse_agent_query(query_data: Dict[str, Any]):
+    """Validate an agent query payload and return (query, context)"""
     query = query_data.get("query", "")
     context = query_data.get("context", {})
     
@@ -26,23 +52,86 @@ async def query_support_agent(query_data: Dict[str, Any]):
     if len(query) > 1000:  # Limit query length
         raise HTTPException(status_code=400, detail="Query too long")
     
-    result = await support_agent.process_query(query, context)
+    return query, context
+
+@router.post("/agents/support/query")
+async def query_support_agent(query_data: Dict[str, Any]):
+    """Send a query to the Support Agent"""
+    query, context = _parse_agent_query(query_data)
+    
+    try:
+        result = await support_agent.process_query(query, context)
+    except AgentPoolFullError:
+        raise HTTPException(status_code=503, detail="Agents are busy, please retry shortly")
     return result
 
 @router.post("/agents/dashboard/query") 
 async def query_dashboard_agent(query_data: Dict[str, Any]):
     """Send a query to the Dashboard Agent"""
-    query = query_data.get("query", "")
-    context = query_data.get("context", {})
+    query, context = _parse_agent_query(query_data)
     
-    if not query:
-        raise HTTPException(status_code=400, detail="Query is required")
+    try:
+        result = await dashboard_agent.process_query(query, context)
+    except AgentPoolFullError:
+        raise HTTPException(status_code=503, detail="Agents are busy, please retry shortly")
+    return result
+
+async def _event_stream(agent, query: str, context: Dict[str, Any]) -> StreamingResponse:
+    """Run an agent query and relay its progress as Server-Sent Events"""
+    try:
+        events = await agent.stream_query(query, context)
+    except AgentPoolFullError:
+        raise HTTPException(status_code=503, detail="Agents are busy, please retry shortly")
     
-    if len(query) > 1000:  # Limit query length
-        raise HTTPException(status_code=400, detail="Query too long")
+    async def sse():
+        async for event, data in events:
+            if event == "ping":
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
     
-    result = await dashboard_agent.process_query(query, context)
-    return result
+    return StreamingResponse(
+        sse(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/agents/support/stream")
+async def stream_support_agent(query_data: Dict[str, Any]):
+    """Send a query to the Support Agent and stream its progress"""
+    query, context = _parse_agent_query(query_data)
+    return await _event_stream(support_agent, query, context)
+
+@router.post("/agents/dashboard/stream")
+async def stream_dashboard_agent(query_data: Dict[str, Any]):
+    """Send a query to the Dashboard Agent and stream its progress"""
+    query, context = _parse_agent_query(query_data)
+    return await _event_stream(dashboard_agent, query, context)
+
+@router.post("/agents/support/jobs", status_code=202)
+async def create_support_job(query_data: Dict[str, Any]):
+    """Queue a query for the Support Agent and return a job id to poll"""
+    query, context = _parse_agent_query(query_data)
+    job_id = await create_job(support_agent, query, context)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/agents/jobs/{job_id}"}
+
+@router.post("/agents/dashboard/jobs", status_code=202)
+async def create_dashboard_job(query_data: Dict[str, Any]):
+    """Queue a query for the Dashboard Agent and return a job id to poll"""
+    query, context = _parse_agent_query(query_data)
+    job_id = await create_job(dashboard_agent, query, context)
+    return {"job_id": job_id, "status": "queued", "status_url": f"/api/agents/jobs/{job_id}"}
+
+@router.get("/agents/jobs/{job_id}")
+async def get_agent_job(job_id: str):
+    """Get the status and result of an agent job"""
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=400, detail="Invalid job ID")
+    
+    job = await get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return MongoJSONResponse(job)
 
 @router.get("/agents/status")
 async def get_agent_status():
@@ -50,33 +139,66 @@ async def get_agent_status():
     return {
         "support_agent": {
             "status": "active",
-            "capabilities": support_agent.get_capabilities()
+            "capabilities": support_agent.get_capabilities(),
+            "crew_pool": support_agent.crew_pool.get_metrics()
         },
         "dashboard_agent": {
             "status": "active", 
-            "capabilities": dashboard_agent.get_capabilities()
-        }
+            "capabilities": dashboard_agent.get_capabilities(),
+            "crew_pool": dashboard_agent.crew_pool.get_metrics()
+        },
+        "worker_pool": agent_pool.get_metrics(),
+        "answer_cache": agent_cache.get_metrics(),
+        "llm_cache": completion_cache.get_metrics(),
+        "routing": fast_path.get_metrics(),
+        "tool_bridge": loop_bridge.get_metrics(),
+        "tool_output": compaction_stats.get_metrics(),
+        "analytics_cache": analytics_cache.get_metrics(),
+        "list_counts": count_cache.get_metrics(),
+        "order_numbers": order_numbers.get_metrics(),
+        "course_catalog": course_catalog.get_metrics()
     }
 
 # Client management endpoints
 @router.get("/clients")
-async def list_clients(skip: int = 0, limit: int = 100, status: Optional[str] = None):
-    """List all clients with optional filtering"""
+async def list_clients(skip: int = 0, limit: int = 100, status: Optional[str] = None, cursor: Optional[str] = None,
+                       include_total: bool = True, fields: Optional[str] = None):
+    """List all clients with optional filtering, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to page through
+    the listing; ``skip`` still works but deep pages are slow. Totals are
+    estimated or briefly cached, and skipped with ``include_total=false``.
+    ``fields`` takes a preset (``summary``, ``full``) or a comma list.
+    """
     db = get_database()
     
     filter_query = {}
     if status:
         filter_query["status"] = status
+    skip = max(0, skip)
+    limit = max(1, min(limit, 100))
     
-    clients = await db.clients.find(filter_query).skip(skip).limit(limit).to_list(length=limit)
-    total = await db.clients.count_documents(filter_query)
+    try:
+        projection = resolve_projection("clients", fields)
+        clients, next_cursor = await fetch_page(db.clients, filter_query, limit, cursor=cursor, skip=skip, projection=projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await list_total(db, "clients", filter_query, include_total)
     
-    return {
+    return MongoJSONResponse({
         "clients": clients,
         "total": total,
         "skip": skip,
-        "limit": limit
-    }
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
+
+@router.post("/clients/bulk")
+async def create_clients_bulk(items: List[Dict[str, Any]]):
+    """Create many clients at once, returning a result per item"""
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    return await bulk_create_clients(get_database(), items)
 
 @router.post("/clients")
 async def create_client(client_data: ClientCreate):
@@ -93,55 +215,145 @@ async def create_client(client_data: ClientCreate):
     client_dict["updated_at"] = datetime.utcnow()
     client_dict["status"] = "active"
     client_dict["enrolled_courses"] = []
+    with_search_fields(client_dict)
     
     result = await db.clients.insert_one(client_dict)
+    agent_cache.invalidate("clients")
+    count_cache.invalidate("clients")
+    await record_new_client(db, client_dict)
     
     return {
         "message": "Client created successfully",
         "client_id": str(result.inserted_id)
     }
 
+# Fields returned by the client detail and search endpoints
+CLIENT_ENROLLED_COURSES_LIMIT = 100
+CLIENT_DETAIL_FIELDS = {
+    **{name: 0 for name in HIDDEN_FIELDS["clients"]},
+    "enrolled_courses": {"$slice": CLIENT_ENROLLED_COURSES_LIMIT}
+}
+CLIENT_SEARCH_FIELDS = {"name": 1, "email": 1, "phone": 1, "status": 1, "created_at": 1}
+CLIENT_ORDER_FIELDS = {
+    "order_number": 1, "course_id": 1, "service_name": 1, "amount": 1, "discount_applied": 1,
+    "final_amount": 1, "currency": 1, "status": 1, "payment_status": 1, "created_at": 1
+}
+CLIENT_PAYMENT_FIELDS = {
+    "order_id": 1, "amount": 1, "currency": 1, "payment_method": 1, "transaction_id": 1,
+    "status": 1, "payment_date": 1, "created_at": 1
+}
+
+def _client_object_id(client_id: str) -> ObjectId:
+    if not ObjectId.is_valid(client_id):
+        raise HTTPException(status_code=400, detail="Invalid client ID")
+    return ObjectId(client_id)
+
+async def _client_page(collection, client_id: ObjectId, fields: Dict[str, Any], limit: int, cursor: Optional[str] = None):
+    try:
+        return await fetch_page(collection, {"client_id": client_id}, limit, cursor=cursor, projection=fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/clients/search")
+async def search_clients(q: str, limit: int = 20):
+    """Find clients by partial name, email prefix or phone digits"""
+    try:
+        query = build_search_query(q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    limit = max(1, min(limit, 100))
+    clients = await get_database().clients.find(query, CLIENT_SEARCH_FIELDS).limit(limit).to_list(length=limit)
+    return MongoJSONResponse({"clients": clients, "count": len(clients)})
+
 @router.get("/clients/{client_id}")
-async def get_client(client_id: str):
-    """Get client details by ID"""
+async def get_client(client_id: str, limit: int = 20, fields: Optional[str] = None):
+    """Get client details with their latest orders and payments.
+
+    Older orders and payments are loaded through the ``/orders`` and
+    ``/payments`` sub-resources with the returned cursors. The whole-client
+    view caps ``enrolled_courses`` at ``CLIENT_ENROLLED_COURSES_LIMIT``.
+    """
     db = get_database()
-    
+    oid = _client_object_id(client_id)
+    limit = max(1, min(limit, 100))
     try:
-        client = await db.clients.find_one({"_id": ObjectId(client_id)})
-        if not client:
-            raise HTTPException(status_code=404, detail="Client not found")
-        
-        # Get client's orders and payments
-        orders = await db.orders.find({"client_id": ObjectId(client_id)}).to_list(length=None)
-        payments = await db.payments.find({"client_id": ObjectId(client_id)}).to_list(length=None)
-        
-        return {
-            "client": client,
-            "orders": orders,
-            "payments": payments
-        }
-    except Exception as e:
-        raise HTTPException(status_code=400, detail="Invalid client ID")
+        projection = CLIENT_DETAIL_FIELDS if not fields or fields == "full" else resolve_projection("clients", fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    client, (orders, orders_cursor), (payments, payments_cursor) = await asyncio.gather(
+        db.clients.find_one({"_id": oid}, projection),
+        _client_page(db.orders, oid, CLIENT_ORDER_FIELDS, limit),
+        _client_page(db.payments, oid, CLIENT_PAYMENT_FIELDS, limit)
+    )
+    if not client:
+        raise HTTPException(status_code=404, detail="Client not found")
+    
+    return MongoJSONResponse({
+        "client": client,
+        "orders": orders,
+        "payments": payments,
+        "orders_next_cursor": orders_cursor,
+        "payments_next_cursor": payments_cursor
+    })
+
+@router.get("/clients/{client_id}/orders")
+async def get_client_orders(client_id: str, cursor: Optional[str] = None, limit: int = 20):
+    """Load more of a client's orders, newest first"""
+    orders, next_cursor = await _client_page(
+        get_database().orders, _client_object_id(client_id), CLIENT_ORDER_FIELDS, max(1, min(limit, 100)), cursor
+    )
+    return MongoJSONResponse({"orders": orders, "next_cursor": next_cursor})
+
+@router.get("/clients/{client_id}/payments")
+async def get_client_payments(client_id: str, cursor: Optional[str] = None, limit: int = 20):
+    """Load more of a client's payments, newest first"""
+    payments, next_cursor = await _client_page(
+        get_database().payments, _client_object_id(client_id), CLIENT_PAYMENT_FIELDS, max(1, min(limit, 100)), cursor
+    )
+    return MongoJSONResponse({"payments": payments, "next_cursor": next_cursor})
 
 # Order management endpoints
 @router.get("/orders")
-async def list_orders(skip: int = 0, limit: int = 100, status: Optional[str] = None):
-    """List all orders with optional filtering"""
+async def list_orders(skip: int = 0, limit: int = 100, status: Optional[str] = None, cursor: Optional[str] = None,
+                       include_total: bool = True, fields: Optional[str] = None):
+    """List all orders with optional filtering, newest first.
+
+    Pass the returned ``next_cursor`` back as ``cursor`` to page through
+    the listing; ``skip`` still works but deep pages are slow. Totals are
+    estimated or briefly cached, and skipped with ``include_total=false``.
+    ``fields`` takes a preset (``summary``, ``full``) or a comma list.
+    """
     db = get_database()
     
     filter_query = {}
     if status:
         filter_query["status"] = status
+    skip = max(0, skip)
+    limit = max(1, min(limit, 100))
     
-    orders = await db.orders.find(filter_query).skip(skip).limit(limit).to_list(length=limit)
-    total = await db.orders.count_documents(filter_query)
+    try:
+        projection = resolve_projection("orders", fields)
+        orders, next_cursor = await fetch_page(db.orders, filter_query, limit, cursor=cursor, skip=skip, projection=projection)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    total = await list_total(db, "orders", filter_query, include_total)
     
-    return {
+    return MongoJSONResponse({
         "orders": orders,
         "total": total,
         "skip": skip,
-        "limit": limit
-    }
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
+
+@router.post("/orders/bulk")
+async def create_orders_bulk(items: List[Dict[str, Any]]):
+    """Create many orders at once, returning a result per item"""
+    if len(items) > settings.BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BULK_MAX_ITEMS} items per request")
+    return await bulk_create_orders(get_database(), items)
 
 @router.post("/orders")
 async def create_order(order_data: OrderCreate):
@@ -160,8 +372,7 @@ async def create_order(order_data: OrderCreate):
             raise HTTPException(status_code=404, detail="Course not found")
         
         # Generate order number
-        order_count = await db.orders.count_documents({})
-        order_number = f"ORD-{order_count + 1:06d}"
+        order_number = await next_order_number(db)
         
         order_dict = order_data.dict()
         order_dict["order_number"] = order_number
@@ -175,6 +386,9 @@ async def create_order(order_data: OrderCreate):
         order_dict["updated_at"] = datetime.utcnow()
         
         result = await db.orders.insert_one(order_dict)
+        agent_cache.invalidate("orders")
+        count_cache.invalidate("orders")
+        await record_new_order(db, order_dict)
         
         return {
             "message": "Order created successfully",
@@ -187,117 +401,77 @@ async def create_order(order_data: OrderCreate):
             raise e
         raise HTTPException(status_code=400, detail="Invalid order data")
 
-# Analytics endpoints
-@router.get("/analytics/revenue")
-async def get_revenue_analytics():
-    """Get revenue analytics"""
-    db = get_database()
-    
-    # Monthly revenue
-    pipeline = [
-        {
-            "$match": {
-                "status": "completed",
-                "payment_date": {
-                    "$gte": datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-                }
-            }
-        },
-        {
-            "$group": {
-                "_id": None,
-                "total_revenue": {"$sum": "$amount"},
-                "total_transactions": {"$sum": 1},
-                "average_transaction": {"$avg": "$amount"}
-            }
-        }
-    ]
-    
-    revenue_data = await db.payments.aggregate(pipeline).to_list(length=None)
+# Export endpoints
+@router.get("/export/{collection}")
+async def export_collection(collection: str, format: str = "ndjson", start: Optional[datetime] = None,
+                            end: Optional[datetime] = None, fields: Optional[str] = None):
+    """Stream a whole collection as NDJSON or CSV, optionally limited to a date range"""
+    if collection not in EXPORTS:
+        raise HTTPException(status_code=404, detail=f"Collection '{collection}' cannot be exported")
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail="Format must be ndjson or csv")
+    try:
+        columns = parse_fields(collection, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Outstanding payments
-    outstanding_pipeline = [
-        {
-            "$match": {"status": "pending"}
-        },
-        {
-            "$group": {
-                "_id": None,
-                "total_outstanding": {"$sum": "$amount"},
-                "count": {"$sum": 1}
-            }
-        }
-    ]
+    filename = f"{collection}-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        stream_export(get_database(), collection, format, columns, start, end),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# Import endpoints
+@router.post("/import/{kind}")
+async def import_file(kind: str, file: UploadFile = File(...), format: Optional[str] = None):
+    """Import clients, courses or orders from an uploaded CSV or NDJSON file.
+
+    The request waits for the whole import, so this is meant for small
+    files; large migrations should use ``python -m app.services.imports``.
+    """
+    if kind not in IMPORT_KINDS:
+        raise HTTPException(status_code=404, detail=f"Cannot import '{kind}'")
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    if fmt not in ("csv", "ndjson"):
+        raise HTTPException(status_code=400, detail="Format must be ndjson or csv")
     
-    outstanding_data = await db.payments.aggregate(outstanding_pipeline).to_list(length=None)
+    os.makedirs(settings.IMPORT_REJECT_DIR, exist_ok=True)
+    reject_path = os.path.join(settings.IMPORT_REJECT_DIR, f"{kind}-{datetime.utcnow():%Y%m%d-%H%M%S}.ndjson")
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    with open(reject_path, "w", encoding="utf-8") as rejects:
+        importer = Importer(get_database(), kind, rejects)
+        report = await importer.run(read_rows(stream, fmt))
     
     return {
-        "current_month_revenue": revenue_data[0] if revenue_data else {"total_revenue": 0, "total_transactions": 0, "average_transaction": 0},
-        "outstanding_payments": outstanding_data[0] if outstanding_data else {"total_outstanding": 0, "count": 0}
+        **report,
+        "reject_file": reject_path if importer.rejected else None,
+        "sample_rejects": importer.sample_rejects
     }
 
+# Analytics endpoints
+@router.get("/analytics/revenue")
+async def get_revenue_analytics(request: Request):
+    """Get revenue analytics"""
+    return await analytics_cache.respond(request, lambda: revenue_analytics(get_database()))
+
 @router.get("/analytics/clients")
-async def get_client_analytics():
+async def get_client_analytics(request: Request):
     """Get client analytics"""
-    db = get_database()
-    
-    # Client status distribution
-    pipeline = [
-        {
-            "$group": {
-                "_id": "$status",
-                "count": {"$sum": 1}
-            }
-        }
-    ]
-    
-    status_data = await db.clients.aggregate(pipeline).to_list(length=None)
-    
-    # New clients this month
-    start_of_month = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    new_clients_count = await db.clients.count_documents({
-        "created_at": {"$gte": start_of_month}
-    })
-    
-    return {
-        "status_distribution": status_data,
-        "new_clients_this_month": new_clients_count,
-        "total_clients": await db.clients.count_documents({})
-    }
+    return await analytics_cache.respond(request, lambda: client_analytics(get_database()))
 
 @router.get("/analytics/courses")
-async def get_course_analytics():
+async def get_course_analytics(request: Request):
     """Get course performance analytics"""
-    db = get_database()
-    
-    pipeline = [
-        {
-            "$lookup": {
-                "from": "orders",
-                "localField": "_id",
-                "foreignField": "course_id",
-                "as": "enrollments"
-            }
-        },
-        {
-            "$project": {
-                "name": 1,
-                "instructor": 1,
-                "enrollment_count": {"$size": "$enrollments"},
-                "total_revenue": {
-                    "$sum": {
-                        "$map": {
-                            "input": "$enrollments",
-                            "as": "order",
-                            "in": "$$order.final_amount"
-                        }
-                    }
-                }
-            }
-        },
-        {"$sort": {"enrollment_count": -1}}
-    ]
-    
-    course_data = await db.courses.aggregate(pipeline).to_list(length=None)
-    
-    return {"course_performance": course_data}
\ No newline at end of file
+    return await analytics_cache.respond(request, lambda: course_analytics(get_database()))
+
+@router.post("/analytics/rollups/rebuild")
+async def rebuild_analytics_rollups():
+    """Recompute all analytics rollups from the raw collections"""
+    result = await rebuild_rollups(get_database())
+    return {"message": "Analytics rollups rebuilt", **result}
+
+@router.get("/analytics/rollups/status")
+async def get_rollup_status():
+    """Rollup scheduler state and how far the rollups lag behind the raw data"""
+    return MongoJSONResponse(await rollup_scheduler.get_metrics())
\ No newline at end of file
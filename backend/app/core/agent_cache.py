@@ -0,0 +1,146 @@
+from collections import OrderedDict
+from app.core.config import settings
+from typing import Dict, Any, Optional, Iterable, Set
+import json
+import re
+import threading
+import time
+
+# Collections whose writes invalidate cached answers
+TRACKED_COLLECTIONS = ("orders", "payments", "clients")
+
+# Words that tie a question to the collections its answer is built from
+DEPENDENCY_KEYWORDS = {
+    "payments": ("revenue", "payment", "paid", "pending", "outstanding", "due", "transaction", "collection", "earn"),
+    "orders": ("order", "enrol", "enroll", "course", "class", "revenue", "sale", "booking", "service"),
+    "clients": ("client", "customer", "member", "inactive", "active", "retention", "joined", "signup", "email", "phone")
+}
+
+# Queries that ask the agent to change something must always reach the crew
+WRITE_INTENT = re.compile(r"\b(create|book|enrol|enroll|register|add|update|change|cancel|pay|send|delete|remove|refund)\b")
+
+class AgentResponseCache:
+    """In-memory LRU cache of agent answers with TTL and write-aware invalidation.
+
+    Keys are the agent name, the normalized query text and the request
+    context. Each entry remembers which tracked collections its answer
+    depends on, and writes to those collections drop it. Entries are evicted
+    least-recently-used first once the cache goes over its byte budget.
+    """
+
+    def __init__(self, ttl_seconds: int, max_bytes: int, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._versions = {name: 0 for name in TRACKED_COLLECTIONS}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Lowercase, collapse whitespace and drop trailing punctuation"""
+        return re.sub(r"\s+", " ", query.strip().lower()).rstrip(" ?!.")
+
+    def make_key(self, agent: str, query: str, context: Dict[str, Any] = None) -> str:
+        context_key = json.dumps(context or {}, sort_keys=True, default=str)
+        return f"{agent}|{self.normalize_query(query)}|{context_key}"
+
+    def is_cacheable(self, query: str) -> bool:
+        return self.enabled and not WRITE_INTENT.search(self.normalize_query(query))
+
+    def dependencies_for(self, query: str) -> Set[str]:
+        """Guess the collections an answer depends on, all of them if unsure"""
+        normalized = self.normalize_query(query)
+        deps = {
+            name for name, words in DEPENDENCY_KEYWORDS.items()
+            if any(word in normalized for word in words)
+        }
+        return deps or set(TRACKED_COLLECTIONS)
+
+    def versions(self, deps: Iterable[str]) -> Dict[str, int]:
+        """Current write versions, captured before a crew run starts"""
+        with self._lock:
+            return {name: self._versions[name] for name in deps}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry["expires_at"] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self._misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry["response"]
+
+    def set(self, key: str, response: Any, deps: Set[str], versions: Dict[str, int]):
+        """Store an answer unless one of its collections changed during the run"""
+        size = len(key) + len(str(response).encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if any(self._versions[name] != version for name, version in versions.items()):
+                return
+
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = {
+                "response": response,
+                "deps": deps,
+                "size": size,
+                "expires_at": time.monotonic() + self.ttl_seconds
+            }
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self._evictions += 1
+
+    def invalidate(self, *collections: str):
+        """Drop answers that depend on any of the given collections"""
+        changed = set(collections) & set(TRACKED_COLLECTIONS)
+        if not changed:
+            return
+
+        with self._lock:
+            for name in changed:
+                self._versions[name] += 1
+            stale = [key for key, entry in self._entries.items() if entry["deps"] & changed]
+            for key in stale:
+                self._drop(key)
+            self._invalidations += len(stale)
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry["size"]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations
+            }
+
+
+agent_cache = AgentResponseCache(
+    settings.AGENT_CACHE_TTL_SECONDS,
+    settings.AGENT_CACHE_MAX_BYTES,
+    settings.AGENT_CACHE_ENABLED
+)
@@ -0,0 +1,134 @@
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.agent_pool import AgentPoolFullError
+from typing import Dict, Any, Optional
+from datetime import datetime, timedelta
+from bson import ObjectId
+import asyncio
+import logging
+import os
+import socket
+import uuid
+
+# Identifies the process that owns a job, for debugging stuck jobs
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+PENDING_STATUSES = ("queued", "running")
+
+# Keep references so running jobs are not garbage collected mid-flight
+_running_jobs = set()
+
+async def create_job(agent, query: str, context: Dict[str, Any] = None) -> str:
+    """Persist a new agent job and start running it in the background"""
+    db = get_database()
+    now = datetime.utcnow()
+
+    job = {
+        "agent": agent.name,
+        "query": query,
+        "context": context or {},
+        "status": "queued",
+        "result": None,
+        "error": None,
+        "worker": WORKER_ID,
+        "created_at": now,
+        "updated_at": now,
+        "started_at": None,
+        "finished_at": None
+    }
+
+    result = await db.agent_jobs.insert_one(job)
+    job_id = result.inserted_id
+
+    task = asyncio.create_task(_run_job(agent, job_id, query, context))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+
+    return str(job_id)
+
+async def _run_job(agent, job_id: ObjectId, query: str, context: Dict[str, Any] = None):
+    """Run the agent for a job and record the outcome"""
+    db = get_database()
+    waited = 0
+
+    try:
+        while True:
+            try:
+                await _update_job(db, job_id, {"status": "running", "started_at": datetime.utcnow()})
+                result = await agent.process_query(query, context)
+                break
+            except AgentPoolFullError:
+                # Jobs wait for pool capacity instead of failing straight away
+                if waited >= settings.AGENT_JOB_MAX_WAIT_SECONDS:
+                    await _update_job(db, job_id, {
+                        "status": "failed",
+                        "error": "Agents were busy for too long, job was not started",
+                        "finished_at": datetime.utcnow()
+                    })
+                    return
+                await _update_job(db, job_id, {"status": "queued", "started_at": None})
+                await asyncio.sleep(1)
+                waited += 1
+
+        if result.get("status") == "success":
+            update = {"status": "completed", "result": result.get("response")}
+        else:
+            update = {"status": "failed", "error": result.get("error")}
+        update["finished_at"] = datetime.utcnow()
+        await _update_job(db, job_id, update)
+
+    except asyncio.CancelledError:
+        await _update_job(db, job_id, {
+            "status": "interrupted",
+            "error": "Worker shut down before the job finished",
+            "finished_at": datetime.utcnow()
+        })
+        raise
+    except Exception as e:
+        logging.error(f"Agent job {job_id} failed: {e}")
+        await _update_job(db, job_id, {"status": "failed", "error": str(e), "finished_at": datetime.utcnow()})
+
+async def _update_job(db, job_id: ObjectId, fields: Dict[str, Any]):
+    fields["updated_at"] = datetime.utcnow()
+    await db.agent_jobs.update_one({"_id": job_id}, {"$set": fields})
+
+async def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch a job by id, flagging jobs whose worker went away"""
+    db = get_database()
+    job = await db.agent_jobs.find_one({"_id": ObjectId(job_id)})
+    if not job:
+        return None
+
+    stale_before = datetime.utcnow() - timedelta(seconds=settings.AGENT_JOB_STALE_SECONDS)
+    if job["status"] in PENDING_STATUSES and job["updated_at"] < stale_before:
+        update = {
+            "status": "interrupted",
+            "error": "Job did not finish, the worker running it probably restarted",
+            "finished_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        await db.agent_jobs.update_one(
+            {"_id": job["_id"], "status": {"$in": list(PENDING_STATUSES)}},
+            {"$set": update}
+        )
+        job.update(update)
+
+    return {
+        "job_id": str(job["_id"]),
+        "agent": job["agent"],
+        "status": job["status"],
+        "query": job["query"],
+        "result": job.get("result"),
+        "error": job.get("error"),
+        "created_at": job["created_at"],
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at")
+    }
+
+async def cancel_running_jobs():
+    """Cancel in-process jobs on shutdown so they are marked interrupted"""
+    tasks = list(_running_jobs)
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,111 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import deque
+from typing import Any, Callable, Dict
+import asyncio
+import threading
+import time
+
+from app.core.config import settings
+
+
+class AgentPoolFullError(Exception):
+    """Raised when the agent pool queue is already at capacity"""
+
+
+class AgentWorkerPool:
+    """Dedicated thread pool for blocking CrewAI crew runs.
+
+    Crews call the LLM synchronously, so running ``crew.kickoff()`` on the
+    event loop stalls every other request on the worker. This pool runs them
+    on their own threads, caps how many may wait in line and keeps queue-depth
+    and wait-time metrics for the status endpoint.
+    """
+
+    def __init__(self, max_workers: int, max_queue_size: int):
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent-worker")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits = deque(maxlen=512)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``func`` on a pool thread and await its result"""
+        return await self.submit(func, *args, **kwargs)
+
+    def submit(self, func: Callable[..., Any], *args, **kwargs) -> "asyncio.Future":
+        """Queue ``func`` on a pool thread and return an awaitable future.
+
+        Raises ``AgentPoolFullError`` immediately when the queue is full, so
+        callers can refuse the request before committing to a response.
+        """
+        with self._lock:
+            if self._queued + self._active >= self.max_workers + self.max_queue_size:
+                self._rejected += 1
+                raise AgentPoolFullError("Agent worker pool is at capacity")
+            self._queued += 1
+            self._submitted += 1
+
+        submitted_at = time.perf_counter()
+
+        def job():
+            waited = time.perf_counter() - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+                self._recent_waits.append(waited)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+        future = self._executor.submit(job)
+        future.add_done_callback(self._on_done)
+        return asyncio.wrap_future(future)
+
+    def _on_done(self, future: Future):
+        with self._lock:
+            if future.cancelled():
+                # The job never started, so it still counts as queued
+                self._queued -= 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, throughput and wait times"""
+        with self._lock:
+            started = self._submitted - self._queued
+            waits = sorted(self._recent_waits)
+            p95 = waits[int(len(waits) * 0.95) - 1] if waits else 0.0
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_size": self.max_queue_size,
+                "active": self._active,
+                "queue_depth": self._queued,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(self._total_wait / started * 1000, 2) if started else 0.0,
+                "p95_wait_ms": round(p95 * 1000, 2),
+                "max_wait_ms": round(self._max_wait * 1000, 2)
+            }
+
+    def shutdown(self):
+        """Stop accepting work and drop anything still waiting"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+agent_pool = AgentWorkerPool(settings.AGENT_POOL_WORKERS, settings.AGENT_POOL_QUEUE_SIZE)
@@ -20,9 +20,70 @@ class Settings(BaseSettings):
     SENDGRID_API_KEY: Optional[str] = None
     TWILIO_AUTH_TOKEN: Optional[str] = None
     
+    # LLM settings
+    LLM_MODEL: str = "gpt-4o-mini"
+    
+    # LLM completion cache: off, read_write, record or replay
+    LLM_CACHE_MODE: str = "read_write"
+    LLM_CACHE_PATH: str = "data/llm_cache.sqlite3"
+    LLM_CACHE_MAX_BYTES: int = 256 * 1024 * 1024
+    
     # Agent Configuration
     MAX_QUERY_LENGTH: int = 1000
     AGENT_TIMEOUT: int = 30
+    AGENT_POOL_WORKERS: int = 4
+    AGENT_POOL_QUEUE_SIZE: int = 16
+    
+    # Event loop bridge used by the synchronous CrewAI tools
+    TOOL_CALL_TIMEOUT: float = 20.0
+    TOOL_BRIDGE_MAX_POOL_SIZE: int = 20
+    
+    # Limits applied to every agent database query
+    TOOL_MAX_RESULTS: int = 50
+    TOOL_QUERY_MAX_TIME_MS: int = 5000
+    
+    # Prompt tokens a single tool result may use once compacted
+    TOOL_RESULT_TOKEN_BUDGET: int = 800
+    
+    # Agent answer cache
+    AGENT_CACHE_ENABLED: bool = True
+    AGENT_CACHE_TTL_SECONDS: int = 600
+    AGENT_CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    
+    # Background agent jobs
+    AGENT_JOB_TTL_SECONDS: int = 86400
+    AGENT_JOB_MAX_WAIT_SECONDS: int = 300
+    AGENT_JOB_STALE_SECONDS: int = 900
+    
+    # Cached analytics responses
+    ANALYTICS_CACHE_ENABLED: bool = True
+    ANALYTICS_CACHE_TTL_SECONDS: int = 30
+    
+    # Order numbers each worker reserves per trip to the counters collection
+    ORDER_NUMBER_BLOCK_SIZE: int = 50
+    
+    # Largest batch accepted by the bulk create endpoints
+    BULK_MAX_ITEMS: int = 5000
+    
+    # Documents read and encoded per chunk of a streaming export
+    EXPORT_BATCH_SIZE: int = 1000
+    
+    # Streaming file imports
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_CONCURRENCY: int = 4
+    IMPORT_REJECT_DIR: str = "data/import_rejects"
+    
+    # How long the in-memory course catalog is used before reloading
+    COURSE_CATALOG_TTL_SECONDS: int = 300
+    
+    # How long filtered list totals are reused
+    LIST_COUNT_CACHE_TTL_SECONDS: int = 30
+    
+    # Background analytics rollup refresh
+    ROLLUP_SCHEDULER_ENABLED: bool = True
+    ROLLUP_REFRESH_INTERVAL_SECONDS: int = 60
+    ROLLUP_LOCK_TTL_SECONDS: int = 300
+    ROLLUP_WATERMARK_OVERLAP_SECONDS: int = 120
     
     class Config:
         env_file = ".env"
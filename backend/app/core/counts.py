@@ -0,0 +1,65 @@
+from app.core.config import settings
+from typing import Dict, Any, Optional, Tuple
+import json
+import threading
+import time
+
+class CountCache:
+    """Totals for list endpoints that don't rescan the collection per request.
+
+    An unfiltered total comes from the collection metadata
+    (``estimated_document_count``). Filtered totals, such as the per-status
+    views, are counted once and reused for a short TTL. Writes to a
+    collection drop its cached counts.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._estimated = 0
+
+    async def count(self, db, collection: str, filter_query: Dict[str, Any]) -> int:
+        if not filter_query:
+            with self._lock:
+                self._estimated += 1
+            return await db[collection].estimated_document_count()
+
+        key = (collection, json.dumps(filter_query, sort_keys=True, default=str))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        total = await db[collection].count_documents(filter_query)
+        with self._lock:
+            self._entries[key] = (total, time.monotonic() + self.ttl_seconds)
+        return total
+
+    def invalidate(self, *collections: str):
+        """Forget cached counts for the given collections, safe from any thread"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in collections]:
+                del self._entries[key]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "estimated": self._estimated
+            }
+
+
+count_cache = CountCache(settings.LIST_COUNT_CACHE_TTL_SECONDS)
+
+async def list_total(db, collection: str, filter_query: Dict[str, Any], include_total: bool = True) -> Optional[int]:
+    """Total for a listing, or None when the caller opted out"""
+    if not include_total:
+        return None
+    return await count_cache.count(db, collection, filter_query)
\ No newline at end of file
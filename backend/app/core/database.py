@@ -1,5 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from app.core.config import settings
+from app.core.sequences import renumber_duplicate_order_numbers
 import logging
 
 class MongoDB:
@@ -33,16 +34,44 @@ async def create_indexes():
     await db.clients.create_index("email", unique=True)
     await db.clients.create_index("phone")
     await db.clients.create_index("created_at")
+    await db.clients.create_index("updated_at")
+    
+    # Normalized fields behind /clients/search (see app/services/client_search.py)
+    await db.clients.create_index("name_tokens")
+    await db.clients.create_index("email_lc")
+    await db.clients.create_index("phone_digits")
+    await db.clients.create_index("phone_local")
+    # Listing indexes also carry the "summary" fields so table pages are covered queries
+    await db.clients.create_index([("created_at", -1), ("_id", -1), ("name", 1), ("email", 1), ("phone", 1), ("status", 1)])
+    await db.clients.create_index([("status", 1), ("created_at", -1), ("_id", -1), ("name", 1), ("email", 1), ("phone", 1)])
     
     # Orders collection indexes
+    # Older count-based numbering could repeat numbers, fix those before enforcing uniqueness
+    await renumber_duplicate_order_numbers(db)
+    await db.orders.create_index("order_number", unique=True)
     await db.orders.create_index("client_id")
+    await db.orders.create_index([("client_id", 1), ("created_at", -1), ("_id", -1)])
     await db.orders.create_index("status")
     await db.orders.create_index("created_at")
+    await db.orders.create_index("updated_at")
+    await db.orders.create_index([
+        ("created_at", -1), ("_id", -1), ("order_number", 1), ("service_name", 1),
+        ("final_amount", 1), ("status", 1), ("payment_status", 1)
+    ])
+    await db.orders.create_index([
+        ("status", 1), ("created_at", -1), ("_id", -1), ("order_number", 1),
+        ("service_name", 1), ("final_amount", 1), ("payment_status", 1)
+    ])
+    # Course performance sorts then groups orders by course_id, a covered scan of this index
+    await db.orders.create_index([("course_id", 1), ("final_amount", 1)])
     
     # Payments collection indexes
     await db.payments.create_index("order_id")
+    await db.payments.create_index([("client_id", 1), ("created_at", -1), ("_id", -1)])
     await db.payments.create_index("status")
     await db.payments.create_index("payment_date")
+    await db.payments.create_index("created_at")
+    await db.payments.create_index("updated_at")
     
     # Courses collection indexes
     await db.courses.create_index("name")
@@ -57,6 +86,9 @@ async def create_indexes():
     # Attendance collection indexes
     await db.attendance.create_index(["client_id", "class_id"], unique=True)
     await db.attendance.create_index("date")
+    
+    # Agent jobs expire automatically once their results are no longer needed
+    await db.agent_jobs.create_index("created_at", expireAfterSeconds=settings.AGENT_JOB_TTL_SECONDS)
 
 async def close_db():
     """Close database connection"""
@@ -0,0 +1,52 @@
+from typing import Dict, Any, Iterable, List, Optional
+import re
+
+# Named field presets per collection. "summary" matches the columns of the
+# management tables and is fully contained in the listing indexes, so those
+# pages are answered from the index alone (covered queries).
+PRESETS = {
+    "clients": {
+        "summary": ("name", "email", "phone", "status", "created_at")
+    },
+    "orders": {
+        "summary": ("order_number", "service_name", "final_amount", "status", "payment_status", "created_at")
+    }
+}
+
+# Internal fields kept for indexing, left out of whole-document responses
+HIDDEN_FIELDS = {
+    "clients": ("name_tokens", "email_lc", "phone_digits", "phone_local")
+}
+
+FIELD_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z0-9_]+)*$")
+
+def without_subpaths(names: Iterable[str]) -> List[str]:
+    """Drop repeated names and paths under another selected name.
+
+    MongoDB rejects a projection holding a path next to one of its parents
+    (``address`` and ``address.city``); the parent already includes it.
+    """
+    selected = dict.fromkeys(names)
+    return [name for name in selected if not any(name.startswith(parent + ".") for parent in selected)]
+
+def resolve_projection(collection: str, fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Turn a ``fields=`` value (preset name or comma list) into a projection.
+
+    ``None`` and ``full`` return whole documents without the collection's
+    ``HIDDEN_FIELDS`` (``None`` when there are none). ``created_at`` is
+    always kept because the pagination cursor is built from it, and
+    sub-paths of a selected field are dropped since the parent already
+    includes them.
+    """
+    if not fields or fields == "full":
+        hidden = HIDDEN_FIELDS.get(collection)
+        return {name: 0 for name in hidden} if hidden else None
+
+    names = PRESETS.get(collection, {}).get(fields)
+    if names is None:
+        names = tuple(name.strip() for name in fields.split(",") if name.strip())
+        invalid = [name for name in names if not FIELD_NAME.match(name)]
+        if invalid or not names:
+            raise ValueError(f"Invalid fields: {', '.join(invalid) or fields}")
+
+    return {name: 1 for name in without_subpaths(names + ("created_at",))}
\ No newline at end of file
@@ -0,0 +1,146 @@
+from app.core.config import settings
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Supported cache modes
+CACHE_OFF = "off"                # always call the model, never touch the cache
+CACHE_READ_WRITE = "read_write"  # serve hits, call and store on misses
+CACHE_RECORD = "record"          # always call the model and overwrite entries
+CACHE_REPLAY = "replay"          # serve hits only, a miss is an error
+
+CACHE_MODES = (CACHE_OFF, CACHE_READ_WRITE, CACHE_RECORD, CACHE_REPLAY)
+
+class CompletionCacheMiss(Exception):
+    """Raised in replay mode when a prompt has no recorded completion"""
+
+class CompletionCache:
+    """Disk-backed cache of LLM completions stored in SQLite.
+
+    Entries are keyed by a hash of the model, the prompt messages and the
+    sampling parameters. When the stored completions grow past
+    ``max_bytes`` the least recently used ones are deleted. The database
+    runs in WAL mode so several workers can share one file; the size
+    budget is checked against the file's total, not this process's writes.
+    """
+
+    def __init__(self, path: str, max_bytes: int, mode: str = CACHE_READ_WRITE):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unsupported LLM cache mode: {mode}")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self._conn = None
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used_at)")
+            self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def make_key(model: str, messages: Any, params: Dict[str, Any]) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._misses += 1
+                return None
+
+            conn.execute("UPDATE completions SET last_used_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            self._hits += 1
+            return row[0]
+
+    def set(self, key: str, model: str, response: str):
+        size = len(response.encode("utf-8"))
+        now = time.time()
+
+        with self._lock:
+            conn = self._connect()
+            # Take the write lock first, so the size check below sees every
+            # worker's entries and no other worker writes in between
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, size, created_at, last_used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, response, size, now, now)
+                )
+                self._bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+                self._stores += 1
+
+                if self._bytes > self.max_bytes:
+                    self._evict(conn)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Delete least recently used completions until 90% of the budget is free"""
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute("SELECT key, size FROM completions ORDER BY last_used_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if self._bytes <= target:
+                break
+            doomed.append((key,))
+            self._bytes -= size
+        conn.executemany("DELETE FROM completions WHERE key = ?", doomed)
+        self._evictions += len(doomed)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "evictions": self._evictions
+            }
+
+
+completion_cache = CompletionCache(
+    settings.LLM_CACHE_PATH,
+    settings.LLM_CACHE_MAX_BYTES,
+    settings.LLM_CACHE_MODE
+)
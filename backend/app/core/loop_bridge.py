@@ -0,0 +1,138 @@
+from motor.motor_asyncio import AsyncIOMotorClient
+from app.core.config import settings
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Dict, Optional
+import asyncio
+import logging
+import threading
+import time
+
+class LoopBridge:
+    """Long-lived background event loop that sync CrewAI tools run coroutines on.
+
+    Tools are called synchronously from agent worker threads. Instead of
+    creating and closing an event loop per call (and borrowing a Motor client
+    bound to the API's loop), every tool submits its coroutine here. The
+    bridge owns a Motor client created on its own loop, so its connection
+    pool is reused across calls and threads.
+    """
+
+    def __init__(self, mongodb_url: str, database_name: str, max_pool_size: int, timeout: float):
+        self.mongodb_url = mongodb_url
+        self.database_name = database_name
+        self.max_pool_size = max_pool_size
+        self.timeout = timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[AsyncIOMotorClient] = None
+        self._database = None
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._errors = 0
+        self._timeouts = 0
+        self._in_flight = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._recent_latencies = deque(maxlen=512)
+
+    def start(self):
+        """Start the loop thread and connect its Motor client (idempotent)"""
+        with self._start_lock:
+            if self._thread is not None:
+                return
+
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self._serve, args=(loop,), name="tool-loop-bridge", daemon=True)
+            thread.start()
+            self._loop = loop
+            self._thread = thread
+
+            # Create the client on the bridge loop so Motor binds to it
+            asyncio.run_coroutine_threadsafe(self._connect(), loop).result(self.timeout)
+            logging.info("Tool loop bridge started")
+
+    @staticmethod
+    def _serve(loop: asyncio.AbstractEventLoop):
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    async def _connect(self):
+        self._client = AsyncIOMotorClient(self.mongodb_url, maxPoolSize=self.max_pool_size)
+        self._database = self._client[self.database_name]
+
+    @property
+    def database(self):
+        """Database handle bound to the bridge loop, only use it from bridge coroutines"""
+        self.start()
+        return self._database
+
+    def run(self, coro: Awaitable[Any], timeout: float = None) -> Any:
+        """Run a coroutine on the bridge loop and block until it finishes"""
+        self.start()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("LoopBridge.run() cannot be called from the bridge loop itself")
+
+        started = time.perf_counter()
+        with self._lock:
+            self._calls += 1
+            self._in_flight += 1
+
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout or self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self._timeouts += 1
+            raise TimeoutError(f"Tool call timed out after {timeout or self.timeout}s")
+        except Exception:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._in_flight -= 1
+                self._total_latency += elapsed
+                self._max_latency = max(self._max_latency, elapsed)
+                self._recent_latencies.append(elapsed)
+
+    def stop(self):
+        """Close the Motor client and stop the loop thread"""
+        with self._start_lock:
+            if self._thread is None:
+                return
+
+            loop = self._loop
+            if self._client is not None:
+                loop.call_soon_threadsafe(self._client.close)
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join(timeout=5)
+            loop.close()
+            self._loop = self._thread = self._client = self._database = None
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._recent_latencies)
+            p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+            return {
+                "running": self._thread is not None,
+                "calls": self._calls,
+                "in_flight": self._in_flight,
+                "errors": self._errors,
+                "timeouts": self._timeouts,
+                "avg_latency_ms": round(self._total_latency / self._calls * 1000, 2) if self._calls else 0.0,
+                "p95_latency_ms": round(p95 * 1000, 2),
+                "max_latency_ms": round(self._max_latency * 1000, 2)
+            }
+
+
+loop_bridge = LoopBridge(
+    settings.MONGODB_URL,
+    settings.DATABASE_NAME,
+    settings.TOOL_BRIDGE_MAX_POOL_SIZE,
+    settings.TOOL_CALL_TIMEOUT
+)
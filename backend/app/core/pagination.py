@@ -0,0 +1,54 @@
+from bson import ObjectId
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+import base64
+import json
+
+# Listings are returned newest first; _id breaks ties between equal timestamps
+KEYSET_SORT = [("created_at", -1), ("_id", -1)]
+
+def encode_cursor(document: Dict[str, Any]) -> str:
+    """Opaque continuation token pointing just past ``document``"""
+    payload = json.dumps({"t": document["created_at"].isoformat(), "i": str(document["_id"])}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """Parse a continuation token, raises ValueError if it was tampered with"""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+        return datetime.fromisoformat(payload["t"]), ObjectId(payload["i"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def keyset_filter(filter_query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """Restrict ``filter_query`` to documents that sort after the cursor"""
+    if not cursor:
+        return filter_query
+
+    created_at, last_id = decode_cursor(cursor)
+    after = {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": last_id}}
+    ]}
+    return {"$and": [filter_query, after]} if filter_query else after
+
+async def fetch_page(collection, filter_query: Dict[str, Any], limit: int, cursor: Optional[str] = None,
+                     skip: int = 0, projection: Dict[str, Any] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page in (created_at, _id) order and the token for the next one.
+
+    With a cursor the query seeks straight to the page through the
+    compound index, so every page costs the same. ``skip`` is still honoured
+    for old clients but gets slower the deeper it goes.
+    """
+    query = collection.find(keyset_filter(filter_query, cursor), projection).sort(KEYSET_SORT)
+    if skip and not cursor:
+        query = query.skip(skip)
+
+    # One extra document tells us whether there is a next page
+    documents = await query.limit(limit + 1).to_list(length=limit + 1)
+    if len(documents) <= limit:
+        return documents, None
+
+    documents = documents[:limit]
+    last = documents[-1]
+    return documents, encode_cursor(last) if last.get("created_at") else None
\ No newline at end of file
@@ -0,0 +1,112 @@
+from fastapi import Request, Response
+from app.core.config import settings
+from app.core.responses import dumps
+from typing import Dict, Any, Callable, Awaitable
+import asyncio
+import hashlib
+import threading
+import time
+
+class CachedResponse:
+    """Serialized response body with its strong ETag"""
+
+    def __init__(self, body: bytes, expires_at: float):
+        self.body = body
+        self.etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+        self.expires_at = expires_at
+
+class ResponseCache:
+    """TTL cache of serialized JSON responses for read-heavy endpoints.
+
+    Concurrent misses for the same key share one computation (single
+    flight), so a burst of dashboard loads runs each aggregation once.
+    Responses carry a strong ETag and a matching If-None-Match is answered
+    with 304 and no body. Any write that changes analytics calls
+    invalidate(); results computed across an invalidation are not stored.
+    """
+
+    def __init__(self, ttl_seconds: float, enabled: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: Dict[str, CachedResponse] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._shared = 0
+        self._not_modified = 0
+        self._invalidations = 0
+
+    def invalidate(self):
+        """Drop every cached response, safe to call from any thread"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidations += 1
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[Any]]) -> CachedResponse:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.monotonic():
+                self._hits += 1
+                return entry
+            generation = self._generation
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self._shared += 1
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            entry = CachedResponse(dumps(await compute()), time.monotonic() + self.ttl_seconds)
+            with self._lock:
+                self._misses += 1
+                if generation == self._generation:
+                    self._entries[key] = entry
+            future.set_result(entry)
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters see the error; mark it retrieved so it is not logged as unhandled
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def respond(self, request: Request, compute: Callable[[], Awaitable[Any]]) -> Response:
+        """Serve a cached JSON response for the request, honouring If-None-Match"""
+        if not self.enabled:
+            return Response(dumps(await compute()), media_type="application/json")
+
+        key = request.url.path + ("?" + request.url.query if request.url.query else "")
+        entry = await self._load(key, compute)
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+
+        if_none_match = request.headers.get("if-none-match", "")
+        if entry.etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+            with self._lock:
+                self._not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        return Response(entry.body, media_type="application/json", headers=headers)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self._hits,
+                "misses": self._misses,
+                "shared": self._shared,
+                "not_modified": self._not_modified,
+                "invalidations": self._invalidations
+            }
+
+
+analytics_cache = ResponseCache(settings.ANALYTICS_CACHE_TTL_SECONDS, settings.ANALYTICS_CACHE_ENABLED)
\ No newline at end of file
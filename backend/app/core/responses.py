@@ -0,0 +1,32 @@
+from fastapi.responses import JSONResponse
+from bson import ObjectId, Decimal128
+from typing import Any
+import orjson
+
+def _default(value: Any) -> Any:
+    """BSON types orjson doesn't know about"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """Serialize Mongo documents straight to JSON bytes.
+
+    datetimes, dates and UUIDs are handled natively by orjson and come out
+    in ISO 8601, like jsonable_encoder; ObjectIds become their hex string.
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response for raw Motor documents.
+
+    Return it from a route directly (``return MongoJSONResponse({...})``):
+    FastAPI only skips jsonable_encoder when it is handed a Response.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
\ No newline at end of file
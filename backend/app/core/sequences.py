@@ -0,0 +1,146 @@
+from app.core.config import settings
+from collections import deque
+from pymongo import ReturnDocument, UpdateOne
+from typing import Awaitable, Callable, Dict, Any, List, Optional
+import logging
+import threading
+
+class SequenceAllocator:
+    """Hands out unique, increasing-per-block numbers from a ``counters`` document.
+
+    Each process reserves a block of numbers with one atomic ``$inc`` and
+    serves allocations from memory until the block runs out, so most calls
+    never touch the database. Blocks reserved by different workers never
+    overlap; numbers are unique but not strictly in creation order across
+    workers, and a restart skips whatever was left of its block.
+
+    Allocations can come from both the API loop and the tool loop bridge,
+    so the in-memory blocks are guarded by a thread lock that is never held
+    across an await.
+    """
+
+    def __init__(self, name: str, block_size: int, seed: Callable[[Any], Awaitable[int]] = None):
+        self.name = name
+        self.block_size = block_size
+        # Returns the highest number already in use, for counters created after the data
+        self._seed = seed
+        self._seeded = False
+        self._ranges: "deque[list]" = deque()
+        self._lock = threading.Lock()
+        self._allocated = 0
+        self._reservations = 0
+
+    def _take(self) -> Optional[int]:
+        with self._lock:
+            while self._ranges:
+                current = self._ranges[0]
+                if current[0] < current[1]:
+                    number = current[0]
+                    current[0] += 1
+                    self._allocated += 1
+                    return number
+                self._ranges.popleft()
+            return None
+
+    async def _ensure_seeded(self, db):
+        if not self._seeded and self._seed is not None:
+            # $max makes seeding safe to repeat from every worker
+            await db.counters.update_one(
+                {"_id": self.name},
+                {"$max": {"value": await self._seed(db)}},
+                upsert=True
+            )
+            self._seeded = True
+
+    async def _reserve(self, db):
+        await self._ensure_seeded(db)
+        counter = await db.counters.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"value": self.block_size}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        end = counter["value"] + 1
+        with self._lock:
+            self._ranges.append([end - self.block_size, end])
+            self._reservations += 1
+
+    async def allocate(self, db) -> int:
+        while True:
+            number = self._take()
+            if number is not None:
+                return number
+            await self._reserve(db)
+
+    async def allocate_many(self, db, count: int) -> List[int]:
+        """Reserve ``count`` consecutive numbers in one trip, for bulk inserts"""
+        if count <= 0:
+            return []
+        await self._ensure_seeded(db)
+        counter = await db.counters.find_one_and_update(
+            {"_id": self.name},
+            {"$inc": {"value": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        with self._lock:
+            self._allocated += count
+            self._reservations += 1
+        return list(range(counter["value"] - count + 1, counter["value"] + 1))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "allocated": self._allocated,
+                "reservations": self._reservations,
+                "remaining": sum(end - start for start, end in self._ranges)
+            }
+
+async def _highest_order_number(db) -> int:
+    # Compare numerically, the string order breaks once numbers outgrow the padding
+    result = await db.orders.aggregate([
+        {"$match": {"order_number": {"$regex": r"^ORD-\d+$"}}},
+        {"$group": {"_id": None, "highest": {"$max": {"$toLong": {"$substrCP": ["$order_number", 4, 32]}}}}}
+    ]).to_list(length=1)
+    return int(result[0]["highest"]) if result else 0
+
+order_numbers = SequenceAllocator("order_number", settings.ORDER_NUMBER_BLOCK_SIZE, seed=_highest_order_number)
+
+def format_order_number(number: int) -> str:
+    return f"ORD-{number:06d}"
+
+async def next_order_number(db) -> str:
+    """Allocate the next ``ORD-xxxxxx`` order number"""
+    return format_order_number(await order_numbers.allocate(db))
+
+async def renumber_duplicate_order_numbers(db) -> int:
+    """Give fresh numbers to orders that share an order number.
+
+    Numbering used to be derived from a document count, which could hand
+    the same number to concurrent orders. The oldest order keeps its
+    number, the others get new ones, so the unique index can be built.
+    Orders without a number are numbered too. Returns how many changed.
+    """
+    # Nothing to do once the unique index exists
+    indexes = await db.orders.index_information()
+    if indexes.get("order_number_1", {}).get("unique"):
+        return 0
+
+    groups = await db.orders.aggregate([
+        {"$sort": {"created_at": 1, "_id": 1}},
+        {"$group": {"_id": "$order_number", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"$or": [{"count": {"$gt": 1}}, {"_id": None}]}}
+    ], allowDiskUse=True).to_list(length=None)
+
+    # Orders without a number get one as well, the rest keep the oldest order's number
+    order_ids = [order_id for group in groups for order_id in (group["ids"] if group["_id"] is None else group["ids"][1:])]
+    if not order_ids:
+        return 0
+
+    numbers = await order_numbers.allocate_many(db, len(order_ids))
+    await db.orders.bulk_write([
+        UpdateOne({"_id": order_id}, {"$set": {"order_number": format_order_number(number)}})
+        for order_id, number in zip(order_ids, numbers)
+    ], ordered=False)
+    logging.warning(f"Renumbered {len(order_ids)} orders with a duplicate or missing order number")
+    return len(order_ids)
@@ -1,19 +1,37 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import logging
 import uvicorn
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import init_db, close_db, get_database
+from app.core.agent_pool import agent_pool
+from app.core.agent_jobs import cancel_running_jobs
+from app.core.loop_bridge import loop_bridge
+from app.services.rollup_scheduler import rollup_scheduler
+from app.services.client_search import backfill_search_fields
+from app.services.course_catalog import course_catalog
 from app.api.routes import router as api_router
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     await init_db()
+    updated = await backfill_search_fields(get_database())
+    if updated:
+        logging.info(f"Added search fields to {updated} clients")
+    await course_catalog.load(get_database())
+    loop_bridge.start()
+    if settings.ROLLUP_SCHEDULER_ENABLED:
+        rollup_scheduler.start()
     yield
     # Shutdown
-    pass
+    await rollup_scheduler.stop()
+    await cancel_running_jobs()
+    agent_pool.shutdown()
+    loop_bridge.stop()
+    await close_db()
 
 app = FastAPI(
     title="Multi-Agent Assignment System",
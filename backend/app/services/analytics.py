@@ -0,0 +1,126 @@
+from app.services.rollups import rollups_ready, read_revenue_rollup, read_client_rollup, read_course_rollup
+from datetime import datetime
+from typing import Dict, Any
+
+def start_of_month() -> datetime:
+    return datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+async def get_revenue_analytics(db) -> Dict[str, Any]:
+    """Revenue analytics from the rollups, or from raw payments until they are built"""
+    if await rollups_ready(db):
+        return await read_revenue_rollup(db, start_of_month())
+    return await compute_revenue_analytics(db)
+
+async def get_client_analytics(db) -> Dict[str, Any]:
+    """Client analytics from the rollups, or from raw clients until they are built"""
+    if await rollups_ready(db):
+        return await read_client_rollup(db, start_of_month())
+    return await compute_client_analytics(db)
+
+async def get_course_analytics(db) -> Dict[str, Any]:
+    """Course analytics from the rollups, or from raw orders until they are built"""
+    if await rollups_ready(db):
+        return await read_course_rollup(db)
+    return await compute_course_analytics(db)
+
+async def compute_revenue_analytics(db) -> Dict[str, Any]:
+    """Current month revenue and outstanding payments"""
+    # Monthly revenue
+    pipeline = [
+        {
+            "$match": {
+                "status": "completed",
+                "payment_date": {"$gte": start_of_month()}
+            }
+        },
+        {
+            "$group": {
+                "_id": None,
+                "total_revenue": {"$sum": "$amount"},
+                "total_transactions": {"$sum": 1},
+                "average_transaction": {"$avg": "$amount"}
+            }
+        }
+    ]
+    
+    revenue_data = await db.payments.aggregate(pipeline).to_list(length=None)
+    
+    # Outstanding payments
+    outstanding_pipeline = [
+        {
+            "$match": {"status": "pending"}
+        },
+        {
+            "$group": {
+                "_id": None,
+                "total_outstanding": {"$sum": "$amount"},
+                "count": {"$sum": 1}
+            }
+        }
+    ]
+    
+    outstanding_data = await db.payments.aggregate(outstanding_pipeline).to_list(length=None)
+    
+    return {
+        "current_month_revenue": revenue_data[0] if revenue_data else {"total_revenue": 0, "total_transactions": 0, "average_transaction": 0},
+        "outstanding_payments": outstanding_data[0] if outstanding_data else {"total_outstanding": 0, "count": 0}
+    }
+
+async def compute_client_analytics(db) -> Dict[str, Any]:
+    """Client status distribution and growth"""
+    # Client status distribution
+    pipeline = [
+        {
+            "$group": {
+                "_id": "$status",
+                "count": {"$sum": 1}
+            }
+        }
+    ]
+    
+    status_data = await db.clients.aggregate(pipeline).to_list(length=None)
+    
+    # New clients this month
+    new_clients_count = await db.clients.count_documents({
+        "created_at": {"$gte": start_of_month()}
+    })
+    
+    return {
+        "status_distribution": status_data,
+        "new_clients_this_month": new_clients_count,
+        "total_clients": await db.clients.count_documents({})
+    }
+
+# Group the large orders collection down to one row per course first, then
+# union in the small courses collection so courses without orders still show
+# up with zero enrollments. No order arrays are ever embedded in a document.
+# The leading $sort lets the planner walk the (course_id, final_amount) index
+# as a covered scan instead of reading every order document.
+COURSE_PERFORMANCE_PIPELINE = [
+    {"$sort": {"course_id": 1}},
+    {"$group": {"_id": "$course_id", "enrollment_count": {"$sum": 1}, "total_revenue": {"$sum": "$final_amount"}}},
+    {
+        "$unionWith": {
+            "coll": "courses",
+            "pipeline": [{"$project": {"name": 1, "instructor": 1, "enrollment_count": {"$literal": 0}, "total_revenue": {"$literal": 0}}}]
+        }
+    },
+    {
+        "$group": {
+            "_id": "$_id",
+            "name": {"$max": "$name"},
+            "instructor": {"$max": "$instructor"},
+            "enrollment_count": {"$sum": "$enrollment_count"},
+            "total_revenue": {"$sum": "$total_revenue"}
+        }
+    },
+    # Orders pointing at deleted courses have no name to report
+    {"$match": {"name": {"$ne": None}}},
+    {"$sort": {"enrollment_count": -1}}
+]
+
+async def compute_course_analytics(db) -> Dict[str, Any]:
+    """Enrollment count and revenue per course"""
+    course_data = await db.orders.aggregate(COURSE_PERFORMANCE_PIPELINE).to_list(length=None)
+    
+    return {"course_performance": course_data}
\ No newline at end of file
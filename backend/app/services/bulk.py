@@ -0,0 +1,167 @@
+"""
+Bulk creation of clients and orders.
+
+Every item is validated on its own with the same models as the single-item
+endpoints, so one bad record is reported instead of failing the batch.
+References are resolved with one ``$in`` lookup per collection and the
+valid records are written with a single unordered ``insert_many``.
+"""
+
+from app.core.agent_cache import agent_cache
+from app.core.counts import count_cache
+from app.core.sequences import order_numbers, format_order_number
+from app.models import ClientCreate, OrderCreate
+from app.services.rollups import record_new_clients, record_new_orders
+from app.services.client_search import with_search_fields
+from bson import ObjectId
+from datetime import datetime
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError
+from typing import Dict, Any, List, Tuple
+import time
+
+def _validation_message(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}"
+        for item in error.errors()
+    )
+
+def _validate(model, index: int, item: Any, results: List[Dict[str, Any]]):
+    if not isinstance(item, dict):
+        results[index] = {"index": index, "status": "error", "error": "Item must be an object"}
+        return None
+    try:
+        return model(**item)
+    except ValidationError as e:
+        results[index] = {"index": index, "status": "error", "error": _validation_message(e)}
+        return None
+
+async def _insert(collection, pending: List[Tuple[int, Dict[str, Any]]], results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Unordered insert of (index, document) pairs, returns the documents that were written"""
+    if not pending:
+        return []
+
+    failed = {}
+    try:
+        await collection.insert_many([document for _, document in pending], ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed[error["index"]] = "Duplicate record" if error.get("code") == 11000 else error.get("errmsg", "Write failed")
+
+    written = []
+    for position, (index, document) in enumerate(pending):
+        if position in failed:
+            results[index] = {"index": index, "status": "error", "error": failed[position]}
+        else:
+            results[index] = {"index": index, "status": "created", "id": str(document["_id"])}
+            written.append(document)
+    return written
+
+def _summary(results: List[Dict[str, Any]], started: float) -> Dict[str, Any]:
+    elapsed = time.perf_counter() - started
+    created = sum(1 for result in results if result["status"] == "created")
+    return {
+        "received": len(results),
+        "created": created,
+        "failed": len(results) - created,
+        "duration_ms": round(elapsed * 1000, 1),
+        "records_per_second": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "results": results
+    }
+
+async def bulk_create_clients(db, items: List[Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = [None] * len(items)
+    now = datetime.utcnow()
+
+    candidates = []
+    seen_emails = set()
+    for index, item in enumerate(items):
+        client = _validate(ClientCreate, index, item, results)
+        if client is None:
+            continue
+        if client.email in seen_emails:
+            results[index] = {"index": index, "status": "error", "error": "Email repeated in this batch"}
+            continue
+        seen_emails.add(client.email)
+        candidates.append((index, client))
+
+    existing = {
+        doc["email"]
+        for doc in await db.clients.find({"email": {"$in": list(seen_emails)}}, {"email": 1}).to_list(length=None)
+    }
+
+    pending = []
+    for index, client in candidates:
+        if client.email in existing:
+            results[index] = {"index": index, "status": "error", "error": "Email already exists"}
+            continue
+        document = client.dict()
+        document.update(created_at=now, updated_at=now, status="active", enrolled_courses=[])
+        pending.append((index, with_search_fields(document)))
+
+    written = await _insert(db.clients, pending, results)
+    if written:
+        agent_cache.invalidate("clients")
+        count_cache.invalidate("clients")
+        await record_new_clients(db, written)
+
+    return _summary(results, started)
+
+async def bulk_create_orders(db, items: List[Any]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    results: List[Dict[str, Any]] = [None] * len(items)
+    now = datetime.utcnow()
+
+    candidates = []
+    for index, item in enumerate(items):
+        order = _validate(OrderCreate, index, item, results)
+        if order is None:
+            continue
+        if not ObjectId.is_valid(order.client_id) or not ObjectId.is_valid(order.course_id):
+            results[index] = {"index": index, "status": "error", "error": "Invalid client or course ID"}
+            continue
+        candidates.append((index, order))
+
+    client_ids = list({ObjectId(order.client_id) for _, order in candidates})
+    course_ids = list({ObjectId(order.course_id) for _, order in candidates})
+    known_clients = {doc["_id"] for doc in await db.clients.find({"_id": {"$in": client_ids}}, {"_id": 1}).to_list(length=None)}
+    known_courses = {doc["_id"] for doc in await db.courses.find({"_id": {"$in": course_ids}}, {"_id": 1}).to_list(length=None)}
+
+    valid = []
+    for index, order in candidates:
+        if ObjectId(order.client_id) not in known_clients:
+            results[index] = {"index": index, "status": "error", "error": "Client not found"}
+        elif ObjectId(order.course_id) not in known_courses:
+            results[index] = {"index": index, "status": "error", "error": "Course not found"}
+        else:
+            valid.append((index, order))
+
+    # One counter trip for the whole batch
+    numbers = await order_numbers.allocate_many(db, len(valid))
+    pending = []
+    for (index, order), number in zip(valid, numbers):
+        document = order.dict()
+        document.update(
+            order_number=format_order_number(number),
+            client_id=ObjectId(order.client_id),
+            course_id=ObjectId(order.course_id),
+            currency="INR",
+            status="pending",
+            payment_status="unpaid",
+            final_amount=order.amount - order.discount_applied,
+            created_at=now,
+            updated_at=now
+        )
+        pending.append((index, document))
+
+    written = await _insert(db.orders, pending, results)
+    for index, document in pending:
+        if results[index]["status"] == "created":
+            results[index]["order_number"] = document["order_number"]
+    if written:
+        agent_cache.invalidate("orders")
+        count_cache.invalidate("orders")
+        await record_new_orders(db, written)
+
+    return _summary(results, started)
\ No newline at end of file
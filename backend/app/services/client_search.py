@@ -0,0 +1,95 @@
+"""
+Indexed client search by partial name, email or phone.
+
+Every client document carries normalized copies of its searchable fields:
+- name_tokens: lowercase words of the name (multikey index)
+- email_lc: lowercase email
+- phone_digits / phone_local: the phone number's digits, and its last ten
+
+Searches become prefix ranges ($gte/$lt) on those indexes instead of
+case-insensitive regex scans. Clients written before these fields existed
+are filled in at startup, or with:
+
+    python -m app.services.client_search
+"""
+
+from pymongo import UpdateOne
+from typing import Any, Dict, List
+import re
+
+LOCAL_PHONE_DIGITS = 10
+
+def _tokens(text: str) -> List[str]:
+    return re.findall(r"[^\W_]+", (text or "").lower())
+
+def _digits(text: str) -> str:
+    return re.sub(r"\D", "", text or "")
+
+def search_fields(client: Dict[str, Any]) -> Dict[str, Any]:
+    digits = _digits(client.get("phone"))
+    return {
+        "name_tokens": _tokens(client.get("name")),
+        "email_lc": (client.get("email") or "").lower(),
+        "phone_digits": digits,
+        "phone_local": digits[-LOCAL_PHONE_DIGITS:]
+    }
+
+def with_search_fields(client: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the normalized search fields to a client document before it is written"""
+    client.update(search_fields(client))
+    return client
+
+def prefix_range(prefix: str) -> Dict[str, str]:
+    """Range matching every string that starts with ``prefix``, served by an index"""
+    return {"$gte": prefix, "$lt": prefix[:-1] + chr(ord(prefix[-1]) + 1)}
+
+def build_search_query(text: str) -> Dict[str, Any]:
+    """Pick the index to search from what the text looks like"""
+    text = text.strip().lower()
+    if not text:
+        raise ValueError("Search text is required")
+
+    if "@" in text:
+        return {"email_lc": prefix_range(text)}
+
+    digits = _digits(text)
+    if len(digits) >= 4 and not re.search(r"[a-z]", text):
+        return {"$or": [{"phone_digits": prefix_range(digits)}, {"phone_local": prefix_range(digits)}]}
+
+    tokens = _tokens(text)
+    if not tokens:
+        raise ValueError("Search text is required")
+    if len(tokens) == 1:
+        return {"$or": [{"name_tokens": prefix_range(tokens[0])}, {"email_lc": prefix_range(tokens[0])}]}
+    # Every word must prefix-match one of the name's words
+    return {"name_tokens": {"$all": [{"$elemMatch": prefix_range(token)} for token in tokens]}}
+
+async def backfill_search_fields(db, batch_size: int = 1000) -> int:
+    """Add search fields to clients that don't have them yet"""
+    updated = 0
+    writes = []
+    async for client in db.clients.find({"email_lc": {"$exists": False}}, {"name": 1, "email": 1, "phone": 1}):
+        writes.append(UpdateOne({"_id": client["_id"]}, {"$set": search_fields(client)}))
+        if len(writes) >= batch_size:
+            await db.clients.bulk_write(writes, ordered=False)
+            updated += len(writes)
+            writes = []
+    if writes:
+        await db.clients.bulk_write(writes, ordered=False)
+        updated += len(writes)
+    return updated
+
+if __name__ == "__main__":
+    import asyncio
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.core.config import settings
+
+    async def main():
+        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        try:
+            updated = await backfill_search_fields(client[settings.DATABASE_NAME])
+            print(f"Added search fields to {updated} clients")
+        finally:
+            client.close()
+
+    asyncio.run(main())
\ No newline at end of file
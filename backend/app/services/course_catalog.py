@@ -0,0 +1,146 @@
+from app.core.config import settings
+from difflib import SequenceMatcher
+from typing import Dict, Any, List, Tuple
+import logging
+import re
+import threading
+import time
+
+# A fuzzy match is accepted only if it is this good and clearly ahead of the runner-up
+FUZZY_ACCEPT = 0.75
+FUZZY_MARGIN = 0.1
+# Weaker matches are still offered as candidates if they are this good
+# and within FUZZY_MARGIN of the best one
+FUZZY_CANDIDATE = 0.6
+MAX_CANDIDATES = 3
+
+def normalize_name(name: str) -> str:
+    return " ".join(re.findall(r"[^\W_]+", (name or "").lower()))
+
+def _public(course: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in course.items() if key == "_id" or not key.startswith("_")}
+
+class CourseCatalog:
+    """In-memory copy of the small courses collection for resolving course names.
+
+    Loaded at startup and reloaded once it is older than the TTL or after
+    courses change, so resolving the course named in an order needs no
+    database round trip. Resolution tries a normalized exact match, then
+    whole-word matches, then a ranked fuzzy match; when several courses fit
+    equally well the candidates are returned instead of guessing, and a
+    single weak match comes back as not_found with it as a suggestion.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._courses: List[Dict[str, Any]] = []
+        self._by_name: Dict[str, Dict[str, Any]] = {}
+        self._loaded_at = 0.0
+        self._stale = True
+        self._reloads = 0
+        self._lookups: Dict[str, int] = {"exact": 0, "token": 0, "fuzzy": 0, "ambiguous": 0, "not_found": 0}
+
+    async def load(self, db):
+        courses = await db.courses.find(
+            {},
+            {"name": 1, "instructor": 1, "category": 1, "level": 1, "price_per_session": 1, "status": 1}
+        ).to_list(length=None)
+        for course in courses:
+            course["_normalized"] = normalize_name(course.get("name"))
+            course["_tokens"] = set(course["_normalized"].split())
+
+        with self._lock:
+            self._courses = courses
+            self._by_name = {course["_normalized"]: course for course in courses}
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            self._reloads += 1
+        logging.info(f"Course catalog loaded with {len(courses)} courses")
+
+    def invalidate(self):
+        """Reload on the next lookup, call after courses are written"""
+        with self._lock:
+            self._stale = True
+
+    async def ensure_loaded(self, db):
+        with self._lock:
+            fresh = not self._stale and time.monotonic() - self._loaded_at < self.ttl_seconds
+        if not fresh:
+            await self.load(db)
+
+    def _match(self, name: str) -> Tuple[str, List[Tuple[float, Dict[str, Any]]]]:
+        normalized = normalize_name(name)
+        with self._lock:
+            courses = self._courses
+            exact = self._by_name.get(normalized)
+        if not normalized:
+            return "not_found", []
+        if exact is not None:
+            return "exact", [(1.0, exact)]
+
+        # Every word of the request is a word of the course name, or the other way round
+        tokens = set(normalized.split())
+        by_tokens = [course for course in courses if tokens <= course["_tokens"] or course["_tokens"] <= tokens]
+        if len(by_tokens) == 1:
+            return "token", [(1.0, by_tokens[0])]
+
+        scored = sorted(
+            (
+                (max(
+                    SequenceMatcher(None, normalized, course["_normalized"]).ratio(),
+                    len(tokens & course["_tokens"]) / len(tokens | course["_tokens"])
+                ), course)
+                for course in (by_tokens or courses)
+            ),
+            key=lambda item: item[0],
+            reverse=True
+        )
+        # Courses sharing whole words with the request are candidates however
+        # they score; spelling-only matches need to clear the floor
+        floor = 0.0 if by_tokens else FUZZY_CANDIDATE
+        cutoff = max(floor, scored[0][0] - FUZZY_MARGIN) if scored else floor
+        candidates = [item for item in scored if item[0] >= cutoff][:MAX_CANDIDATES]
+        if not candidates:
+            return "not_found", []
+        best = candidates[0][0]
+        runner_up = candidates[1][0] if len(candidates) > 1 else 0.0
+        if best >= FUZZY_ACCEPT and best - runner_up >= FUZZY_MARGIN:
+            return "fuzzy", candidates[:1]
+        if len(candidates) == 1:
+            # One weak match is a suggestion, not a choice between courses
+            return "not_found", candidates
+        return "ambiguous", candidates
+
+    async def resolve(self, db, name: str) -> Dict[str, Any]:
+        """Resolve a course name to ``{"match", "course", "candidates"}``.
+
+        ``match`` is exact, token, fuzzy, ambiguous or not_found; ``course``
+        is only set when a single course was chosen. ``candidates`` lists
+        the competing courses when ambiguous, or the closest course as a
+        suggestion when not_found.
+        """
+        await self.ensure_loaded(db)
+        kind, ranked = self._match(name)
+        with self._lock:
+            self._lookups[kind] += 1
+        return {
+            "match": kind,
+            "course": _public(ranked[0][1]) if kind not in ("ambiguous", "not_found") else None,
+            "candidates": [
+                {"name": course.get("name"), "instructor": course.get("instructor"), "score": round(score, 2)}
+                for score, course in ranked
+            ] if kind in ("ambiguous", "not_found") else []
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "courses": len(self._courses),
+                "reloads": self._reloads,
+                "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._loaded_at else None,
+                "lookups": dict(self._lookups)
+            }
+
+
+course_catalog = CourseCatalog(settings.COURSE_CATALOG_TTL_SECONDS)
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""
+Streaming exports of whole collections as NDJSON or CSV.
+
+Documents are read from a Motor cursor in batches and encoded one chunk at
+a time, so memory use depends on the batch size and not on the size of the
+collection.
+"""
+
+from app.core.config import settings
+from app.core.fieldsets import FIELD_NAME, without_subpaths
+from bson import ObjectId
+from datetime import datetime, date
+from typing import Any, AsyncIterator, Dict, List, Optional
+import csv
+import io
+import json
+
+# Exportable collections: the field date ranges apply to and the default columns
+EXPORTS = {
+    "clients": {
+        "date_field": "created_at",
+        "fields": ["_id", "name", "email", "phone", "status", "address", "created_at", "updated_at"]
+    },
+    "orders": {
+        "date_field": "created_at",
+        "fields": [
+            "_id", "order_number", "client_id", "course_id", "service_name", "amount", "discount_applied",
+            "final_amount", "currency", "status", "payment_status", "payment_method", "created_at", "updated_at"
+        ]
+    },
+    "payments": {
+        "date_field": "created_at",
+        "fields": [
+            "_id", "order_id", "client_id", "amount", "currency", "payment_method", "transaction_id",
+            "status", "payment_date", "created_at"
+        ]
+    },
+    "attendance": {
+        "date_field": "date",
+        "fields": ["_id", "client_id", "class_id", "course_id", "date", "status", "check_in_time", "check_out_time"]
+    }
+}
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+def _cell(value: Any) -> Any:
+    value = _plain(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, separators=(",", ":"))
+    return "" if value is None else value
+
+def _lookup(document: Dict[str, Any], path: str) -> Any:
+    """Value at a dotted path such as ``address.city``, None if missing"""
+    value = document
+    for part in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+def parse_fields(collection: str, fields: Optional[str]) -> List[str]:
+    """Requested columns, or the collection's defaults.
+
+    Checked up front, because a bad projection would only fail once the
+    response is already streaming.
+    """
+    if not fields:
+        return EXPORTS[collection]["fields"]
+    columns = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+    invalid = [column for column in columns if not FIELD_NAME.match(column)]
+    if invalid or not columns:
+        raise ValueError(f"Invalid fields: {', '.join(invalid) or fields}")
+    return columns
+
+def export_filter(collection: str, start: Optional[datetime], end: Optional[datetime]) -> Dict[str, Any]:
+    date_range = {}
+    if start:
+        date_range["$gte"] = start
+    if end:
+        date_range["$lt"] = end
+    return {EXPORTS[collection]["date_field"]: date_range} if date_range else {}
+
+async def stream_export(db, collection: str, fmt: str, fields: List[str],
+                        start: Optional[datetime] = None, end: Optional[datetime] = None) -> AsyncIterator[bytes]:
+    """Yield the export as encoded chunks of ``EXPORT_BATCH_SIZE`` documents"""
+    batch_size = settings.EXPORT_BATCH_SIZE
+    projection = {field: 1 for field in without_subpaths(fields)}
+    if "_id" not in fields:
+        projection["_id"] = 0
+
+    cursor = db[collection].find(export_filter(collection, start, end), projection, batch_size=batch_size)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(fields)
+
+    rows = 0
+    async for document in cursor:
+        if writer:
+            writer.writerow([_cell(_lookup(document, field)) for field in fields])
+        else:
+            buffer.write(json.dumps(_plain(document), separators=(",", ":")))
+            buffer.write("\n")
+
+        rows += 1
+        if rows % batch_size == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
\ No newline at end of file
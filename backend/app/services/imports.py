@@ -0,0 +1,311 @@
+"""
+Streaming import of clients, courses and orders from CSV or NDJSON files.
+
+Rows are parsed a batch at a time in a worker thread, validated with the
+models in app.models and written in unordered bulk_write batches, with a
+bounded number of batches in flight, so the event loop keeps serving other
+requests during a long import. Order rows may reference clients by email
+and courses by name, or give their ids; both are resolved and checked
+through lookup maps loaded once up front. Rows that fail validation or the
+write go to an NDJSON reject file with their line number and error.
+
+    python -m app.services.imports orders orders.csv --rejects orders.rejects.ndjson
+"""
+
+from app.core.agent_cache import agent_cache
+from app.core.config import settings
+from app.core.counts import count_cache
+from app.core.sequences import order_numbers, format_order_number
+from app.models import ClientCreate, CourseCreate, OrderCreate
+from app.services.rollups import record_new_clients, record_new_orders
+from app.services.client_search import with_search_fields
+from app.services.course_catalog import course_catalog
+from bson import ObjectId
+from datetime import datetime, timezone
+from pydantic import ValidationError
+from pymongo import InsertOne
+from pymongo.errors import BulkWriteError
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+import asyncio
+import csv
+import itertools
+import json
+import time
+
+KINDS = ("clients", "courses", "orders")
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Yield (line number, row, parse error) without reading the whole file"""
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for row in reader:
+            # CSV cells are strings; blank cells mean "not given"
+            yield reader.line_num, {
+                key: _csv_value(value) for key, value in row.items()
+                if key is not None and value not in (None, "")
+            }, None
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+def _csv_value(value: str) -> Any:
+    # Lists and objects (tags, schedule, metadata) are given as JSON in CSV cells
+    if value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, ValidationError):
+        return "; ".join(f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors())
+    return str(error)
+
+def _created_at(row: Dict[str, Any], now: datetime) -> datetime:
+    value = row.get("created_at")
+    if not value:
+        return now
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    # Stored times are naive UTC, so convert offsets instead of dropping them
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class Importer:
+    """Validates rows for one collection and writes them in concurrent batches"""
+
+    def __init__(self, db, kind: str, reject_file: Optional[TextIO] = None, batch_size: int = None,
+                 concurrency: int = None, progress: Callable[[Dict[str, Any]], None] = None,
+                 progress_every: int = 10000):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown import kind '{kind}', expected one of {', '.join(KINDS)}")
+        self.db = db
+        self.kind = kind
+        self.reject_file = reject_file
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.concurrency = concurrency or settings.IMPORT_CONCURRENCY
+        self.progress = progress
+        self.progress_every = progress_every
+        self.clients_by_email: Dict[str, ObjectId] = {}
+        self.courses_by_name: Dict[str, ObjectId] = {}
+        self.client_ids = set()
+        self.course_ids = set()
+        self.rows = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.sample_rejects: List[Dict[str, Any]] = []
+        self._started = time.perf_counter()
+
+    async def load_lookups(self):
+        """Map client emails and course names to ids, only needed for orders"""
+        if self.kind != "orders":
+            return
+        async for client in self.db.clients.find({}, {"email": 1}):
+            self.clients_by_email[client["email"].lower()] = client["_id"]
+        async for course in self.db.courses.find({}, {"name": 1}):
+            self.courses_by_name[course["name"].strip().lower()] = course["_id"]
+        # Ids given directly in a row are checked against these
+        self.client_ids = set(self.clients_by_email.values())
+        self.course_ids = set(self.courses_by_name.values())
+
+    def reject(self, line: int, error: str, row: Any = None):
+        self.rejected += 1
+        record = {"line": line, "error": error, "row": row}
+        if len(self.sample_rejects) < 20:
+            self.sample_rejects.append(record)
+        if self.reject_file is not None:
+            self.reject_file.write(json.dumps(record, default=str) + "\n")
+
+    def build(self, row: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+        """Validate a row and turn it into the document to insert"""
+        created_at = _created_at(row, now)
+
+        if self.kind == "clients":
+            document = ClientCreate(**row).dict()
+            document.update(status=row.get("status", "active"), enrolled_courses=[])
+            with_search_fields(document)
+        elif self.kind == "courses":
+            document = CourseCreate(**row).dict()
+            document["status"] = row.get("status", "active")
+        else:
+            row = dict(row)
+            if "client_id" not in row:
+                client_id = self.clients_by_email.get(str(row.get("client_email", "")).lower())
+                if client_id is None:
+                    raise ValueError(f"Unknown client email '{row.get('client_email')}'")
+                row["client_id"] = str(client_id)
+            if "course_id" not in row:
+                course_id = self.courses_by_name.get(str(row.get("course_name", "")).strip().lower())
+                if course_id is None:
+                    raise ValueError(f"Unknown course '{row.get('course_name')}'")
+                row["course_id"] = str(course_id)
+            row.setdefault("service_name", row.get("course_name"))
+
+            order = OrderCreate(**row)
+            client_id = ObjectId(order.client_id) if ObjectId.is_valid(order.client_id) else None
+            course_id = ObjectId(order.course_id) if ObjectId.is_valid(order.course_id) else None
+            if client_id not in self.client_ids:
+                raise ValueError(f"Unknown client_id '{order.client_id}'")
+            if course_id not in self.course_ids:
+                raise ValueError(f"Unknown course_id '{order.course_id}'")
+            document = order.dict()
+            document.update(
+                client_id=client_id,
+                course_id=course_id,
+                currency="INR",
+                status=row.get("status", "pending"),
+                payment_status=row.get("payment_status", "unpaid"),
+                final_amount=order.amount - order.discount_applied
+            )
+
+        document.update(created_at=created_at, updated_at=now)
+        return document
+
+    async def _write(self, batch: List[Tuple[int, Dict[str, Any], Dict[str, Any]]]):
+        if self.kind == "orders":
+            numbers = await order_numbers.allocate_many(self.db, len(batch))
+            for (_, _, document), number in zip(batch, numbers):
+                document["order_number"] = format_order_number(number)
+
+        failed = {}
+        try:
+            await self.db[self.kind].bulk_write([InsertOne(document) for _, _, document in batch], ordered=False)
+        except BulkWriteError as e:
+            for error in e.details.get("writeErrors", []):
+                failed[error["index"]] = "Duplicate record" if error.get("code") == 11000 else error.get("errmsg", "Write failed")
+
+        written = []
+        for position, (line, row, document) in enumerate(batch):
+            if position in failed:
+                self.reject(line, failed[position], row)
+            else:
+                written.append(document)
+        self.inserted += len(written)
+
+        if written and self.kind == "clients":
+            await record_new_clients(self.db, written)
+        elif written and self.kind == "orders":
+            await record_new_orders(self.db, written)
+
+    def _prepare(self, rows: Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]], now: datetime) -> List[Tuple[int, Any, Optional[Dict[str, Any]], Optional[str]]]:
+        """Read and validate the next batch of rows, runs in a worker thread"""
+        prepared = []
+        for line, row, error in itertools.islice(rows, self.batch_size):
+            document = None
+            if error is None:
+                try:
+                    document = self.build(row, now)
+                except (ValidationError, ValueError, TypeError) as e:
+                    error = _error_message(e)
+            prepared.append((line, row, document, error))
+        return prepared
+
+    def report(self) -> Dict[str, Any]:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "rejected": self.rejected,
+            "duration_s": round(elapsed, 2),
+            "rows_per_second": round(self.rows / elapsed, 1) if elapsed else 0.0
+        }
+
+    async def run(self, rows: Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]) -> Dict[str, Any]:
+        self._started = time.perf_counter()
+        await self.load_lookups()
+        now = datetime.utcnow()
+
+        in_flight = set()
+        batch = []
+
+        async def flush():
+            nonlocal batch
+            if not batch:
+                return
+            # Bound the batches in flight, which also bounds memory
+            while len(in_flight) >= self.concurrency:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                in_flight.difference_update(done)
+                for task in done:
+                    task.result()
+            in_flight.add(asyncio.create_task(self._write(batch)))
+            batch = []
+
+        # File reads and validation are blocking, keep them off the event loop
+        while True:
+            prepared = await asyncio.to_thread(self._prepare, rows, now)
+            if not prepared:
+                break
+            for line, row, document, error in prepared:
+                self.rows += 1
+                if error is None:
+                    batch.append((line, row, document))
+                else:
+                    self.reject(line, error, row)
+
+                if len(batch) >= self.batch_size:
+                    await flush()
+                if self.progress and self.rows % self.progress_every == 0:
+                    self.progress(self.report())
+
+        await flush()
+        if in_flight:
+            for task in await asyncio.gather(*in_flight, return_exceptions=True):
+                if isinstance(task, Exception):
+                    raise task
+
+        if self.inserted:
+            agent_cache.invalidate(self.kind)
+            count_cache.invalidate(self.kind)
+            if self.kind == "courses":
+                course_catalog.invalidate()
+        return self.report()
+
+if __name__ == "__main__":
+    import argparse
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    parser = argparse.ArgumentParser(description="Import clients, courses or orders from a CSV or NDJSON file")
+    parser.add_argument("kind", choices=KINDS)
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="defaults to the file extension")
+    parser.add_argument("--rejects", help="reject file, defaults to <path>.rejects.ndjson")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=settings.IMPORT_CONCURRENCY)
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+
+    def show(report):
+        print(f"{report['rows']:>10,} rows  {report['inserted']:>10,} inserted  {report['rejected']:>8,} rejected  {report['rows_per_second']:>10,.0f} rows/s")
+
+    async def main():
+        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        try:
+            with open(args.path, newline="", encoding="utf-8-sig") as stream, \
+                    open(args.rejects or args.path + ".rejects.ndjson", "w", encoding="utf-8") as rejects:
+                importer = Importer(
+                    client[settings.DATABASE_NAME], args.kind, rejects,
+                    batch_size=args.batch_size, concurrency=args.concurrency, progress=show
+                )
+                report = await importer.run(read_rows(stream, fmt))
+            show(report)
+            print(f"Done in {report['duration_s']}s, rejects written to {rejects.name}")
+        finally:
+            client.close()
+
+    asyncio.run(main())
\ No newline at end of file
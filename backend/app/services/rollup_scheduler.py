@@ -0,0 +1,136 @@
+from app.core.config import settings
+from app.core.database import get_database
+from app.core.agent_jobs import WORKER_ID
+from app.services.rollups import rebuild_rollups, refresh_changed, get_watermark, set_watermark
+from datetime import datetime, timedelta
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, Any, Optional
+import asyncio
+import logging
+import time
+
+LOCK_ID = "rollups"
+
+class RollupScheduler:
+    """Periodically folds data written outside the API into the analytics rollups.
+
+    Each run looks at documents created or updated since the stored
+    watermark, recomputes only the days and courses they touch and moves the
+    watermark forward. A lock document in ``analytics_locks`` makes sure only
+    one API worker refreshes per interval; the others skip the run.
+    """
+
+    def __init__(self, interval: float, lock_ttl: float, overlap: float):
+        self.interval = interval
+        self.lock_ttl = lock_ttl
+        # Re-scan a little before the watermark to catch writes that were in flight
+        self.overlap = overlap
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._skipped = 0
+        self._errors = 0
+        self._last_run_at: Optional[datetime] = None
+        self._last_duration_ms = 0.0
+        self._last_result: Dict[str, Any] = {}
+        self._last_error: Optional[str] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._serve())
+            logging.info("Rollup scheduler started")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _serve(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
+                logging.error(f"Rollup refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def _acquire(self, db) -> bool:
+        now = datetime.utcnow()
+        try:
+            await db.analytics_locks.find_one_and_update(
+                {"_id": LOCK_ID, "$or": [{"locked_until": {"$lt": now}}, {"owner": WORKER_ID}]},
+                {"$set": {"owner": WORKER_ID, "locked_until": now + timedelta(seconds=self.lock_ttl)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            return True
+        except DuplicateKeyError:
+            # The lock document exists and another worker holds it
+            return False
+
+    async def _release(self, db, started: datetime):
+        # Hold the lock until the next run is due, so the other workers skip
+        # this interval instead of repeating the refresh straight away
+        await db.analytics_locks.update_one(
+            {"_id": LOCK_ID, "owner": WORKER_ID},
+            {"$set": {"locked_until": started + timedelta(seconds=self.interval)}}
+        )
+
+    async def run_once(self) -> Optional[Dict[str, Any]]:
+        """Refresh the rollups if no other worker is doing it, returns None when skipped"""
+        db = get_database()
+        if not await self._acquire(db):
+            self._skipped += 1
+            return None
+
+        started = datetime.utcnow()
+        timer = time.perf_counter()
+        try:
+            watermark = await get_watermark(db)
+            if watermark is None:
+                result = await rebuild_rollups(db)
+                result["mode"] = "rebuild"
+            else:
+                result = await refresh_changed(db, watermark - timedelta(seconds=self.overlap))
+                result["mode"] = "incremental"
+                await set_watermark(db, started)
+        finally:
+            await self._release(db, started)
+
+        self._runs += 1
+        self._last_run_at = started
+        self._last_duration_ms = round((time.perf_counter() - timer) * 1000, 1)
+        self._last_result = result
+        self._last_error = None
+        return result
+
+    async def get_metrics(self) -> Dict[str, Any]:
+        watermark = await get_watermark(get_database())
+        return {
+            "enabled": self._task is not None,
+            "interval_seconds": self.interval,
+            "watermark": watermark,
+            "refresh_lag_seconds": round((datetime.utcnow() - watermark).total_seconds(), 1) if watermark else None,
+            "runs": self._runs,
+            "skipped_locked": self._skipped,
+            "errors": self._errors,
+            "last_run_at": self._last_run_at,
+            "last_duration_ms": self._last_duration_ms,
+            "last_result": self._last_result,
+            "last_error": self._last_error
+        }
+
+
+rollup_scheduler = RollupScheduler(
+    settings.ROLLUP_REFRESH_INTERVAL_SECONDS,
+    settings.ROLLUP_LOCK_TTL_SECONDS,
+    settings.ROLLUP_WATERMARK_OVERLAP_SECONDS
+)
\ No newline at end of file
@@ -0,0 +1,361 @@
+"""
+Incrementally maintained analytics rollups.
+
+Summary documents live in three small collections:
+- analytics_daily: one document per UTC day (_id "YYYY-MM-DD") with revenue,
+  transactions, new_clients, enrollments and order_value
+- analytics_courses: one document per course (_id = course id) with
+  enrollments and revenue
+- analytics_summary: running totals ("clients" status counts, "payments"
+  outstanding amounts) and the "meta" document written by a rebuild
+
+Write paths call the record_* hooks so the rollups stay current, and the
+analytics endpoints read a handful of these documents instead of scanning
+the raw collections. Data written outside the API is picked up by the
+rollup scheduler through refresh_changed(). Rebuild everything from scratch with:
+
+    python -m app.services.rollups
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, List, Optional
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.core.response_cache import analytics_cache
+import logging
+
+def day_key(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+async def _apply(write):
+    """Rollup maintenance must never fail the write that triggered it"""
+    try:
+        await write
+    except Exception as e:
+        logging.error(f"Failed to update analytics rollups: {e}")
+    finally:
+        analytics_cache.invalidate()
+
+async def _inc_day(db, moment: datetime, increments: Dict[str, Any]):
+    await _apply(db.analytics_daily.update_one(
+        {"_id": day_key(moment)},
+        {"$inc": increments, "$setOnInsert": {"date": moment.replace(hour=0, minute=0, second=0, microsecond=0)}},
+        upsert=True
+    ))
+
+async def record_new_client(db, client: Dict[str, Any]):
+    await _inc_day(db, client.get("created_at") or datetime.utcnow(), {"new_clients": 1})
+    await _apply(db.analytics_summary.update_one(
+        {"_id": "clients"},
+        {"$inc": {f"status_counts.{client.get('status', 'active')}": 1, "total": 1}},
+        upsert=True
+    ))
+
+async def record_new_order(db, order: Dict[str, Any]):
+    amount = order.get("final_amount", 0) or 0
+    await _inc_day(db, order.get("created_at") or datetime.utcnow(), {"enrollments": 1, "order_value": amount})
+    await _apply(db.analytics_courses.update_one(
+        {"_id": order["course_id"]},
+        {"$inc": {"enrollments": 1, "revenue": amount}},
+        upsert=True
+    ))
+
+async def record_payment(db, payment: Dict[str, Any]):
+    amount = payment.get("amount", 0) or 0
+    if payment.get("status") == "completed":
+        await _inc_day(db, payment.get("payment_date") or datetime.utcnow(), {"revenue": amount, "transactions": 1})
+    elif payment.get("status") == "pending":
+        await _apply(db.analytics_summary.update_one(
+            {"_id": "payments"},
+            {"$inc": {"outstanding_amount": amount, "outstanding_count": 1}},
+            upsert=True
+        ))
+
+async def _bulk_apply(collection, increments: Dict[Any, Dict[str, Any]], set_on_insert=None):
+    writes = [
+        UpdateOne(
+            {"_id": key},
+            {"$inc": inc, **({"$setOnInsert": set_on_insert(key)} if set_on_insert else {})},
+            upsert=True
+        )
+        for key, inc in increments.items()
+    ]
+    if writes:
+        await _apply(collection.bulk_write(writes, ordered=False))
+
+def _day_start(key: str) -> Dict[str, Any]:
+    return {"date": datetime.strptime(key, "%Y-%m-%d")}
+
+async def record_new_clients(db, clients: List[Dict[str, Any]]):
+    """Batched record_new_client for bulk inserts, one write per touched day"""
+    days: Dict[str, Dict[str, Any]] = {}
+    statuses: Dict[str, int] = {}
+    for client in clients:
+        day = days.setdefault(day_key(client.get("created_at") or datetime.utcnow()), {"new_clients": 0})
+        day["new_clients"] += 1
+        status = client.get("status", "active")
+        statuses[f"status_counts.{status}"] = statuses.get(f"status_counts.{status}", 0) + 1
+
+    await _bulk_apply(db.analytics_daily, days, _day_start)
+    if statuses:
+        await _apply(db.analytics_summary.update_one(
+            {"_id": "clients"},
+            {"$inc": {**statuses, "total": len(clients)}},
+            upsert=True
+        ))
+
+async def record_new_orders(db, orders: List[Dict[str, Any]]):
+    """Batched record_new_order for bulk inserts, one write per touched day and course"""
+    days: Dict[str, Dict[str, Any]] = {}
+    courses: Dict[Any, Dict[str, Any]] = {}
+    for order in orders:
+        amount = order.get("final_amount", 0) or 0
+        day = days.setdefault(day_key(order.get("created_at") or datetime.utcnow()), {"enrollments": 0, "order_value": 0})
+        day["enrollments"] += 1
+        day["order_value"] += amount
+        course = courses.setdefault(order["course_id"], {"enrollments": 0, "revenue": 0})
+        course["enrollments"] += 1
+        course["revenue"] += amount
+
+    await _bulk_apply(db.analytics_daily, days, _day_start)
+    await _bulk_apply(db.analytics_courses, courses)
+
+async def rollups_ready(db) -> bool:
+    """Rollups are only trusted once a full rebuild has populated them"""
+    return await db.analytics_summary.find_one({"_id": "meta"}, {"_id": 1}) is not None
+
+async def read_revenue_rollup(db, since: datetime) -> Dict[str, Any]:
+    days = await db.analytics_daily.find(
+        {"_id": {"$gte": day_key(since)}},
+        {"revenue": 1, "transactions": 1}
+    ).to_list(length=None)
+    payments = await db.analytics_summary.find_one({"_id": "payments"}) or {}
+
+    revenue = sum(day.get("revenue", 0) for day in days)
+    transactions = sum(day.get("transactions", 0) for day in days)
+    return {
+        "current_month_revenue": {
+            "total_revenue": revenue,
+            "total_transactions": transactions,
+            "average_transaction": revenue / transactions if transactions else 0
+        },
+        "outstanding_payments": {
+            "total_outstanding": payments.get("outstanding_amount", 0),
+            "count": payments.get("outstanding_count", 0)
+        }
+    }
+
+async def read_client_rollup(db, since: datetime) -> Dict[str, Any]:
+    days = await db.analytics_daily.find(
+        {"_id": {"$gte": day_key(since)}},
+        {"new_clients": 1}
+    ).to_list(length=None)
+    clients = await db.analytics_summary.find_one({"_id": "clients"}) or {}
+
+    return {
+        "status_distribution": [
+            {"_id": status, "count": count}
+            for status, count in (clients.get("status_counts") or {}).items()
+        ],
+        "new_clients_this_month": sum(day.get("new_clients", 0) for day in days),
+        "total_clients": clients.get("total", 0)
+    }
+
+async def read_course_rollup(db) -> Dict[str, Any]:
+    courses = await db.courses.find({}, {"name": 1, "instructor": 1}).to_list(length=None)
+    stats = {
+        doc["_id"]: doc
+        for doc in await db.analytics_courses.find({}).to_list(length=None)
+    }
+
+    performance = [
+        {
+            "_id": course["_id"],
+            "name": course.get("name"),
+            "instructor": course.get("instructor"),
+            "enrollment_count": stats.get(course["_id"], {}).get("enrollments", 0),
+            "total_revenue": stats.get(course["_id"], {}).get("revenue", 0)
+        }
+        for course in courses
+    ]
+    performance.sort(key=lambda row: row["enrollment_count"], reverse=True)
+    return {"course_performance": performance}
+
+def _by_day(field: str) -> Dict[str, Any]:
+    return {"$dateToString": {"format": "%Y-%m-%d", "date": f"${field}"}}
+
+def _in_days(field: str, days: Optional[Iterable[str]]) -> Dict[str, Any]:
+    """Match documents whose ``field`` falls on one of ``days`` (any date if None)"""
+    if days is None:
+        return {field: {"$type": "date"}}
+    windows = []
+    for key in sorted(days):
+        start = datetime.strptime(key, "%Y-%m-%d")
+        windows.append({field: {"$gte": start, "$lt": start + timedelta(days=1)}})
+    return {"$or": windows}
+
+async def _compute_days(db, days: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Daily rollup values from the raw collections, for all days or just ``days``"""
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def day(key: str) -> Dict[str, Any]:
+        return results.setdefault(key, {
+            "date": datetime.strptime(key, "%Y-%m-%d"),
+            "revenue": 0, "transactions": 0, "new_clients": 0, "enrollments": 0, "order_value": 0
+        })
+
+    # Requested days with no activity left must be reset to zero
+    for key in days or []:
+        day(key)
+
+    async for row in db.payments.aggregate([
+        {"$match": {"status": "completed", **_in_days("payment_date", days)}},
+        {"$group": {"_id": _by_day("payment_date"), "revenue": {"$sum": "$amount"}, "transactions": {"$sum": 1}}}
+    ]):
+        day(row["_id"]).update(revenue=row["revenue"], transactions=row["transactions"])
+
+    async for row in db.clients.aggregate([
+        {"$match": _in_days("created_at", days)},
+        {"$group": {"_id": _by_day("created_at"), "new_clients": {"$sum": 1}}}
+    ]):
+        day(row["_id"])["new_clients"] = row["new_clients"]
+
+    async for row in db.orders.aggregate([
+        {"$match": _in_days("created_at", days)},
+        {"$group": {"_id": _by_day("created_at"), "enrollments": {"$sum": 1}, "order_value": {"$sum": "$final_amount"}}}
+    ]):
+        day(row["_id"]).update(enrollments=row["enrollments"], order_value=row["order_value"])
+
+    return results
+
+async def _compute_courses(db, course_ids: Optional[List[Any]] = None) -> Dict[Any, Dict[str, Any]]:
+    """Per-course rollup values, for all courses or just ``course_ids``"""
+    results = {course_id: {"enrollments": 0, "revenue": 0} for course_id in course_ids or []}
+    match = {"course_id": {"$in": course_ids}} if course_ids is not None else {"course_id": {"$ne": None}}
+    async for row in db.orders.aggregate([
+        {"$match": match},
+        {"$group": {"_id": "$course_id", "enrollments": {"$sum": 1}, "revenue": {"$sum": "$final_amount"}}}
+    ]):
+        results[row["_id"]] = {"enrollments": row["enrollments"], "revenue": row["revenue"]}
+    return results
+
+async def _write_days(db, days: Dict[str, Dict[str, Any]]):
+    writes = [UpdateOne({"_id": key}, {"$set": values}, upsert=True) for key, values in days.items()]
+    if writes:
+        await db.analytics_daily.bulk_write(writes, ordered=False)
+
+async def _write_courses(db, courses: Dict[Any, Dict[str, Any]]):
+    writes = [UpdateOne({"_id": course_id}, {"$set": values}, upsert=True) for course_id, values in courses.items()]
+    if writes:
+        await db.analytics_courses.bulk_write(writes, ordered=False)
+
+async def _refresh_client_summary(db):
+    status_rows = await db.clients.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    status_counts = {str(row["_id"]): row["count"] for row in status_rows}
+    await db.analytics_summary.replace_one(
+        {"_id": "clients"},
+        {"status_counts": status_counts, "total": sum(status_counts.values())},
+        upsert=True
+    )
+
+async def _refresh_payment_summary(db):
+    outstanding = await db.payments.aggregate([
+        {"$match": {"status": "pending"}},
+        {"$group": {"_id": None, "amount": {"$sum": "$amount"}, "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    await db.analytics_summary.replace_one(
+        {"_id": "payments"},
+        {
+            "outstanding_amount": outstanding[0]["amount"] if outstanding else 0,
+            "outstanding_count": outstanding[0]["count"] if outstanding else 0
+        },
+        upsert=True
+    )
+
+async def get_watermark(db) -> Optional[datetime]:
+    state = await db.analytics_summary.find_one({"_id": "watermark"})
+    return state["at"] if state else None
+
+async def set_watermark(db, moment: datetime):
+    await db.analytics_summary.replace_one({"_id": "watermark"}, {"at": moment}, upsert=True)
+
+async def rebuild_rollups(db) -> Dict[str, Any]:
+    """Recompute every rollup document from the raw collections"""
+    started = datetime.utcnow()
+
+    days = await _compute_days(db)
+    await _write_days(db, days)
+    await db.analytics_daily.delete_many({"_id": {"$nin": list(days)}})
+
+    courses = await _compute_courses(db)
+    await _write_courses(db, courses)
+    await db.analytics_courses.delete_many({"_id": {"$nin": list(courses)}})
+
+    await _refresh_client_summary(db)
+    await _refresh_payment_summary(db)
+    await db.analytics_summary.replace_one({"_id": "meta"}, {"built_at": started}, upsert=True)
+    await set_watermark(db, started)
+    analytics_cache.invalidate()
+
+    return {
+        "days": len(days),
+        "courses": len(courses),
+        "duration_ms": round((datetime.utcnow() - started).total_seconds() * 1000, 1)
+    }
+
+def _changed_since(since: datetime) -> Dict[str, Any]:
+    """Documents written after ``since``; the ObjectId time also catches backdated bulk loads"""
+    return {"$or": [
+        {"updated_at": {"$gt": since}},
+        {"created_at": {"$gt": since}},
+        {"_id": {"$gt": ObjectId.from_datetime(since)}}
+    ]}
+
+async def refresh_changed(db, since: datetime) -> Dict[str, Any]:
+    """Recompute only the days and courses touched by writes after ``since``.
+
+    Deleted documents are not detected; run a full rebuild after deletes.
+    """
+    changed = _changed_since(since)
+
+    days = set()
+    for collection, field in (("payments", "payment_date"), ("clients", "created_at"), ("orders", "created_at")):
+        async for row in db[collection].aggregate([
+            {"$match": {**changed, field: {"$type": "date"}}},
+            {"$group": {"_id": _by_day(field)}}
+        ]):
+            days.add(row["_id"])
+
+    course_ids = await db.orders.distinct("course_id", changed)
+    clients_changed = await db.clients.count_documents(changed, limit=1)
+    payments_changed = await db.payments.count_documents(changed, limit=1)
+
+    if days:
+        await _write_days(db, await _compute_days(db, days))
+    if course_ids:
+        await _write_courses(db, await _compute_courses(db, [c for c in course_ids if c is not None]))
+    if clients_changed:
+        await _refresh_client_summary(db)
+    if payments_changed:
+        await _refresh_payment_summary(db)
+    if days or course_ids or clients_changed or payments_changed:
+        analytics_cache.invalidate()
+
+    return {"days": len(days), "courses": len(course_ids)}
+
+if __name__ == "__main__":
+    import asyncio
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from app.core.config import settings
+
+    async def main():
+        client = AsyncIOMotorClient(settings.MONGODB_URL)
+        try:
+            result = await rebuild_rollups(client[settings.DATABASE_NAME])
+            print(f"Rebuilt analytics rollups: {result}")
+        finally:
+            client.close()
+
+    asyncio.run(main())
@@ -1,10 +1,15 @@
 from crewai.tools import BaseTool  # or from crewai.tools import BaseTool if that's where it's available
 from pydantic import PrivateAttr
 from typing import Dict, Any
-import aiohttp
-import asyncio
 from app.core.config import settings
-from app.core.database import get_database
+from app.core.loop_bridge import loop_bridge
+from app.tools.result_formatter import render_tool_result
+from app.services.rollups import record_new_client, record_new_order, record_payment
+from app.services.client_search import with_search_fields
+from app.services.course_catalog import course_catalog
+from app.core.agent_cache import agent_cache
+from app.core.counts import count_cache
+from app.core.sequences import next_order_number
 from bson import ObjectId
 from datetime import datetime
 
@@ -18,19 +23,15 @@ class ExternalAPITool(BaseTool):
     _db: Any = PrivateAttr(default=None)
 
     def _get_db(self):
-        if not self._db:
-            self._db = get_database()
+        # Tool coroutines run on the loop bridge, so use its Motor client
+        if self._db is None:
+            self._db = loop_bridge.database
         return self._db
 
     def _run(self, action: str, **kwargs) -> str:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(self._execute_action(action, **kwargs))
-                return str(result)
-            finally:
-                loop.close()
+            result = loop_bridge.run(self._execute_action(action, **kwargs))
+            return render_tool_result("ExternalAPITool", action, result, settings.TOOL_RESULT_TOKEN_BUDGET)
         except Exception as e:
             return f"External API error: {str(e)}"
 
@@ -56,7 +57,7 @@ class ExternalAPITool(BaseTool):
             db = self._get_db()
             
             # Find or create client
-            client = await db.clients.find_one({"email": client_email})
+            client = await db.clients.find_one({"email_lc": client_email.lower()}, {"_id": 1})
             if not client:
                 # Create new client
                 client_data = {
@@ -68,19 +69,35 @@ class ExternalAPITool(BaseTool):
                     "created_at": datetime.utcnow(),
                     "updated_at": datetime.utcnow()
                 }
-                client_result = await db.clients.insert_one(client_data)
+                client_result = await db.clients.insert_one(with_search_fields(client_data))
                 client_id = client_result.inserted_id
+                await record_new_client(db, client_data)
             else:
                 client_id = client["_id"]
             
             # Find course
-            course = await db.courses.find_one({"name": {"$regex": service_name, "$options": "i"}})
+            resolved = await course_catalog.resolve(db, service_name)
+            if resolved["match"] == "ambiguous":
+                return {
+                    "status": "error",
+                    "message": f"Course '{service_name}' matches several courses, ask which one is meant",
+                    "candidates": resolved["candidates"]
+                }
+            course = resolved["course"]
             if not course:
+                suggestions = resolved["candidates"]
+                if suggestions:
+                    return {
+                        "status": "error",
+                        "message": f"Course '{service_name}' not found, did you mean '{suggestions[0]['name']}'?",
+                        "candidates": suggestions
+                    }
                 return {"status": "error", "message": f"Course '{service_name}' not found"}
+            # Store the catalog's name, not the user's spelling of it
+            service_name = course["name"]
             
             # Generate order number
-            order_count = await db.orders.count_documents({})
-            order_number = f"ORD-{order_count + 1:06d}"
+            order_number = await next_order_number(db)
             
             # Create order
             order_data = {
@@ -101,6 +118,9 @@ class ExternalAPITool(BaseTool):
             }
             
             order_result = await db.orders.insert_one(order_data)
+            agent_cache.invalidate("orders", "clients")
+            count_cache.invalidate("orders", "clients")
+            await record_new_order(db, order_data)
             
             # Send confirmation email (mock)
             await self._send_email(
@@ -205,9 +225,13 @@ class ExternalAPITool(BaseTool):
             # In a real implementation, you would integrate with Stripe, Razorpay, etc.
             transaction_id = f"txn_{datetime.utcnow().timestamp()}"
             
+            # Payments carry the client so the client detail page can find them by index
+            order = await db.orders.find_one({"_id": ObjectId(order_id)}, {"client_id": 1})
+            
             # Create payment record
             payment_data = {
                 "order_id": ObjectId(order_id),
+                "client_id": order.get("client_id") if order else None,
                 "amount": amount,
                 "currency": "INR",
                 "payment_method": payment_method,
@@ -219,6 +243,7 @@ class ExternalAPITool(BaseTool):
             }
             
             await db.payments.insert_one(payment_data)
+            await record_payment(db, payment_data)
             
             # Update order status
             await db.orders.update_one(
@@ -231,6 +256,8 @@ class ExternalAPITool(BaseTool):
                     }
                 }
             )
+            agent_cache.invalidate("payments", "orders")
+            count_cache.invalidate("orders")
             
             return {
                 "status": "success",
@@ -1,63 +1,201 @@
 from crewai.tools import BaseTool  # or from crewai.tools import BaseTool if that's where it's available
 from pydantic import PrivateAttr
-from typing import Dict, Any
-import aiohttp
-import asyncio
+from typing import Dict, Any, List, Optional
 from app.core.config import settings
-from app.core.database import get_database
+from app.core.loop_bridge import loop_bridge
+from app.tools.result_formatter import render_tool_result
+from app.services.analytics import COURSE_PERFORMANCE_PIPELINE
+from app.services.client_search import build_search_query, LOCAL_PHONE_DIGITS
 from bson import ObjectId
-from datetime import datetime
+from datetime import datetime, timedelta
+
+# Collections the agents may read, with the fields returned when no projection is given
+DEFAULT_PROJECTIONS = {
+    "clients": {"name": 1, "email": 1, "phone": 1, "status": 1, "enrolled_courses": 1, "created_at": 1},
+    "orders": {
+        "order_number": 1, "client_id": 1, "course_id": 1, "service_name": 1, "amount": 1,
+        "final_amount": 1, "status": 1, "payment_status": 1, "created_at": 1
+    },
+    "payments": {"order_id": 1, "client_id": 1, "amount": 1, "payment_method": 1, "status": 1, "payment_date": 1},
+    "courses": {
+        "name": 1, "instructor": 1, "category": 1, "level": 1, "duration_minutes": 1,
+        "capacity": 1, "price_per_session": 1, "schedule": 1, "status": 1
+    },
+    "classes": {"course_id": 1, "date": 1, "instructor": 1, "status": 1, "enrolled_count": 1, "capacity": 1},
+    "attendance": {"client_id": 1, "class_id": 1, "course_id": 1, "date": 1, "status": 1},
+    "enquiries": {"name": 1, "email": 1, "phone": 1, "enquiry_type": 1, "status": 1, "created_at": 1}
+}
+
+# Query, pipeline stage and expression operators agents are allowed to use.
+# Anything else ($where, $function, $out, $merge, ...) is rejected.
+ALLOWED_OPERATORS = {
+    # query
+    "$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin", "$and", "$or", "$nor", "$not",
+    "$exists", "$type", "$regex", "$options", "$elemMatch", "$size", "$all", "$expr",
+    # stages
+    "$match", "$group", "$project", "$sort", "$limit", "$skip", "$count", "$unwind",
+    "$lookup", "$unionWith", "$addFields", "$set", "$sortByCount",
+    # accumulators and expressions
+    "$sum", "$avg", "$min", "$max", "$first", "$last", "$push", "$addToSet", "$map", "$filter",
+    "$cond", "$ifNull", "$add", "$subtract", "$multiply", "$divide", "$round", "$toString",
+    "$dateToString", "$year", "$month", "$dayOfMonth", "$dayOfWeek", "$week", "$concat",
+    "$toLower", "$toUpper", "$arrayElemAt", "$literal"
+}
+
+# Actions that map straight onto the query engine
+QUERY_OPERATIONS = ("find", "find_one", "count", "aggregate")
 
 class MongoDBTool(BaseTool):
-    name: str = "External API Integration Tool"
+    name: str = "MongoDB Database Tool"
     description: str = """
-    A tool for integrating with external APIs including payment processors, email services, SMS services, and CRM systems.
-    Supports creating orders, sending notifications, processing payments, and managing client enquiries.
+    Read-only access to the business database (clients, orders, payments, courses, classes, attendance, enquiries).
+    Call it with an action plus keyword arguments:
+    - search_clients(query) for partial names, email prefixes or phone digits
+    - find_client_by_email(email), find_client_by_phone(phone)
+    - get_order_by_id(order_id), get_orders_by_client(client_id), get_pending_payments()
+    - get_revenue_metrics(start_date, end_date), get_client_analytics(), get_course_performance(), get_attendance_stats(course_id)
+    - find / find_one / count / aggregate with collection, query, projection, sort, limit or aggregation_pipeline
+    Results are capped, so narrow queries with filters and aggregations instead of listing whole collections.
     """
 
     _db: Any = PrivateAttr(default=None)
 
     def _get_db(self):
-        if not self._db:
-            self._db = get_database()
+        # Tool coroutines run on the loop bridge, so use its Motor client
+        if self._db is None:
+            self._db = loop_bridge.database
         return self._db
 
     def _run(self, action: str, **kwargs) -> str:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                result = loop.run_until_complete(self._execute_action(action, **kwargs))
-                return str(result)
-            finally:
-                loop.close()
+            result = loop_bridge.run(self._execute_action(action, **kwargs))
+            return render_tool_result("MongoDBTool", action, result, settings.TOOL_RESULT_TOKEN_BUDGET)
         except Exception as e:
-            return f"External API error: {str(e)}"
+            return f"MongoDB query error: {str(e)}"
 
     async def _execute_action(self, action: str, **kwargs) -> Dict[str, Any]:
-        if action == "create_order":
-            return await self._create_order(**kwargs)
-        elif action == "create_client_enquiry":
-            return await self._create_client_enquiry(**kwargs)
-        elif action == "send_email":
-            return await self._send_email(**kwargs)
-        elif action == "send_sms":
-            return await self._send_sms(**kwargs)
-        elif action == "process_payment":
-            return await self._process_payment(**kwargs)
+        if action in QUERY_OPERATIONS:
+            collection = kwargs.pop("collection", None)
+            if not collection:
+                raise ValueError(f"'{action}' needs a collection")
+            return await self._execute_query(action, collection, **kwargs)
+        elif action == "search_clients":
+            return await self.search_clients(**kwargs)
+        elif action == "find_client_by_email":
+            return await self.find_client_by_email(**kwargs)
+        elif action == "find_client_by_phone":
+            return await self.find_client_by_phone(**kwargs)
+        elif action == "get_order_by_id":
+            return await self.get_order_by_id(**kwargs)
+        elif action == "get_orders_by_client":
+            return await self.get_orders_by_client(**kwargs)
+        elif action == "get_pending_payments":
+            return await self.get_pending_payments()
+        elif action == "get_revenue_metrics":
+            return await self.get_revenue_metrics(
+                _parse_date(kwargs.get("start_date")),
+                _parse_date(kwargs.get("end_date"))
+            )
+        elif action == "get_client_analytics":
+            return await self.get_client_analytics()
+        elif action == "get_course_performance":
+            return await self.get_course_performance()
+        elif action == "get_attendance_stats":
+            return await self.get_attendance_stats(kwargs.get("course_id"))
         else:
             raise ValueError(f"Unsupported action: {action}")
 
-    # ...rest of your async methods (_create_order, _create_client_enquiry, etc.) remain unchanged...
+    async def _execute_query(self, operation: str, collection: str, query: Dict[str, Any] = None,
+                             projection: Dict[str, Any] = None, sort: Dict[str, int] = None,
+                             limit: int = None, aggregation_pipeline: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Run a bounded, allow-listed query against one collection.
+
+        Every operation gets a server-side ``maxTimeMS``; find and aggregate
+        are capped at ``TOOL_MAX_RESULTS`` documents and streamed from the
+        cursor, so no call can pull a whole collection into memory.
+        """
+        if collection not in DEFAULT_PROJECTIONS:
+            raise ValueError(f"Collection '{collection}' is not available to agents")
+
+        query = _coerce_ids(query or {})
+        _check_operators(query)
+        _check_projection(projection)
+        _check_sort(sort)
+
+        db = self._get_db()
+        coll = db[collection]
+        max_time_ms = settings.TOOL_QUERY_MAX_TIME_MS
+        cap = min(limit or settings.TOOL_MAX_RESULTS, settings.TOOL_MAX_RESULTS)
+
+        if operation == "count":
+            count = await coll.count_documents(query, maxTimeMS=max_time_ms)
+            return {"operation": operation, "collection": collection, "count": count}
+
+        if operation == "find_one":
+            document = await coll.find_one(
+                query,
+                projection or DEFAULT_PROJECTIONS[collection],
+                max_time_ms=max_time_ms
+            )
+            return {"operation": operation, "collection": collection, "result": document}
+
+        if operation == "find":
+            cursor = coll.find(
+                query,
+                projection or DEFAULT_PROJECTIONS[collection],
+                limit=cap + 1,
+                max_time_ms=max_time_ms,
+                batch_size=cap + 1
+            )
+            if sort:
+                cursor = cursor.sort(list(sort.items()))
+        elif operation == "aggregate":
+            pipeline = _coerce_ids(list(aggregation_pipeline or []))
+            _check_operators(pipeline)
+            for stage in pipeline:
+                lookup = stage.get("$lookup")
+                if lookup and lookup.get("from") not in DEFAULT_PROJECTIONS:
+                    raise ValueError(f"Collection '{lookup.get('from')}' is not available to agents")
+                union = stage.get("$unionWith")
+                union_coll = union.get("coll") if isinstance(union, dict) else union
+                if union and union_coll not in DEFAULT_PROJECTIONS:
+                    raise ValueError(f"Collection '{union_coll}' is not available to agents")
+            if not pipeline or "$count" not in pipeline[-1]:
+                pipeline.append({"$limit": cap + 1})
+            cursor = coll.aggregate(pipeline, maxTimeMS=max_time_ms, batchSize=cap + 1)
+        else:
+            raise ValueError(f"Unsupported operation: {operation}")
+
+        # Fetch one extra document to know whether the result was cut off
+        results = []
+        truncated = False
+        async for document in cursor:
+            if len(results) == cap:
+                truncated = True
+                break
+            results.append(document)
+
+        return {
+            "operation": operation,
+            "collection": collection,
+            "count": len(results),
+            "truncated": truncated,
+            "results": results
+        }
     
     # Specialized query methods
+    async def search_clients(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """Find clients by partial name, email prefix or phone digits"""
+        return await self._execute_query("find", "clients", build_search_query(query), limit=limit)
+    
     async def find_client_by_email(self, email: str) -> Dict[str, Any]:
         """Find a client by email address"""
-        return await self._execute_query("find_one", "clients", {"email": email})
+        return await self._execute_query("find_one", "clients", {"email_lc": email.strip().lower()})
     
     async def find_client_by_phone(self, phone: str) -> Dict[str, Any]:
-        """Find a client by phone number"""
-        return await self._execute_query("find_one", "clients", {"phone": phone})
+        """Find a client by phone number, ignoring spaces and country code"""
+        digits = "".join(ch for ch in phone if ch.isdigit())
+        return await self._execute_query("find_one", "clients", {"phone_local": digits[-LOCAL_PHONE_DIGITS:]})
     
     async def get_order_by_id(self, order_id: str) -> Dict[str, Any]:
         """Get order details by ID"""
@@ -110,34 +248,7 @@ class MongoDBTool(BaseTool):
     
     async def get_course_performance(self) -> Dict[str, Any]:
         """Get course performance metrics"""
-        pipeline = [
-            {
-                "$lookup": {
-                    "from": "orders",
-                    "localField": "_id",
-                    "foreignField": "course_id",
-                    "as": "enrollments"
-                }
-            },
-            {
-                "$project": {
-                    "name": 1,
-                    "instructor": 1,
-                    "enrollment_count": {"$size": "$enrollments"},
-                    "total_revenue": {
-                        "$sum": {
-                            "$map": {
-                                "input": "$enrollments",
-                                "as": "order",
-                                "in": "$$order.final_amount"
-                            }
-                        }
-                    }
-                }
-            },
-            {"$sort": {"enrollment_count": -1}}
-        ]
-        return await self._execute_query("aggregate", "courses", aggregation_pipeline=pipeline)
+        return await self._execute_query("aggregate", "orders", aggregation_pipeline=COURSE_PERFORMANCE_PIPELINE)
     
     async def get_attendance_stats(self, course_id: str = None) -> Dict[str, Any]:
         """Get attendance statistics"""
@@ -154,4 +265,51 @@ class MongoDBTool(BaseTool):
                 }
             }
         ]
-        return await self._execute_query("aggregate", "attendance", aggregation_pipeline=pipeline)
\ No newline at end of file
+        return await self._execute_query("aggregate", "attendance", aggregation_pipeline=pipeline)
+
+def _check_operators(value: Any):
+    """Reject any $-operator that is not on the allow-list"""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.startswith("$") and key not in ALLOWED_OPERATORS:
+                raise ValueError(f"Operator '{key}' is not allowed")
+            _check_operators(item)
+    elif isinstance(value, list):
+        for item in value:
+            _check_operators(item)
+
+def _check_projection(projection: Any):
+    """Only plain include/exclude projections, expressions could smuggle in operators"""
+    if projection is None:
+        return
+    if not isinstance(projection, dict):
+        raise ValueError("Projection must be an object of field: 1 or 0")
+    for field, flag in projection.items():
+        if field.startswith("$") or flag not in (0, 1) or not isinstance(flag, (int, bool)):
+            raise ValueError(f"Projection for '{field}' must be 1 or 0")
+
+def _check_sort(sort: Any):
+    """Sort keys are field names with a direction of 1 or -1"""
+    if sort is None:
+        return
+    if not isinstance(sort, dict):
+        raise ValueError("Sort must be an object of field: 1 or -1")
+    _check_operators(sort)
+    for field, direction in sort.items():
+        if field.startswith("$") or direction not in (1, -1) or isinstance(direction, bool):
+            raise ValueError(f"Sort direction for '{field}' must be 1 or -1")
+
+def _coerce_ids(value: Any, key: str = "") -> Any:
+    """Turn id strings from the LLM into ObjectIds for ``_id``/``*_id`` fields"""
+    if isinstance(value, dict):
+        return {k: _coerce_ids(v, k if not k.startswith("$") else key) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_coerce_ids(item, key) for item in value]
+    if isinstance(value, str) and (key == "_id" or key.endswith("_id")) and ObjectId.is_valid(value):
+        return ObjectId(value)
+    return value
+
+def _parse_date(value: Any) -> Optional[datetime]:
+    if not value or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(str(value))
@@ -0,0 +1,141 @@
+from bson import ObjectId
+from datetime import datetime, date
+from typing import Dict, Any, List, Tuple
+import logging
+import threading
+
+# Fields that never help the agent answer a question
+INTERNAL_FIELDS = {"gateway_response", "metadata", "updated_at", "__v", "password", "hashed_password"}
+
+# Longest cell value kept before it is cut with an ellipsis
+MAX_CELL_CHARS = 60
+
+# Longest list rendered inline in a cell
+MAX_INLINE_ITEMS = 5
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token for English/JSON"""
+    return max(1, len(text) // 4)
+
+def compact_value(value: Any) -> str:
+    """Render a single field value as short plain text"""
+    if value is None:
+        return "-"
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        if (value.hour, value.minute, value.second) == (0, 0, 0):
+            return value.strftime("%Y-%m-%d")
+        return value.strftime("%Y-%m-%d %H:%M")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "yes" if value else "no"
+    if isinstance(value, float):
+        return f"{value:.2f}".rstrip("0").rstrip(".")
+    if isinstance(value, dict):
+        return ", ".join(f"{k}={compact_value(v)}" for k, v in value.items() if k not in INTERNAL_FIELDS)
+    if isinstance(value, (list, tuple)):
+        if len(value) > MAX_INLINE_ITEMS:
+            return f"[{len(value)} items]"
+        return "[" + "; ".join(compact_value(item) for item in value) + "]"
+
+    text = str(value).replace("\n", " ").replace("|", "/")
+    return text if len(text) <= MAX_CELL_CHARS else text[:MAX_CELL_CHARS - 1] + "…"
+
+def _clean(document: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value for key, value in document.items()
+        if key not in INTERNAL_FIELDS and not (key == "_id" and value is None)
+    }
+
+def render_table(rows: List[Dict[str, Any]], token_budget: int) -> Tuple[str, int]:
+    """Render documents as a pipe table within a token budget.
+
+    Returns the table and how many rows fit; the caller reports the rest.
+    """
+    rows = [_clean(row) for row in rows]
+    columns: List[str] = []
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns.append(key)
+
+    lines = [" | ".join(columns)]
+    used = estimate_tokens(lines[0])
+    shown = 0
+    for row in rows:
+        line = " | ".join(compact_value(row.get(column)) for column in columns)
+        cost = estimate_tokens(line)
+        if shown and used + cost > token_budget:
+            break
+        lines.append(line)
+        used += cost
+        shown += 1
+
+    return "\n".join(lines), shown
+
+def compact_result(result: Any, token_budget: int) -> str:
+    """Turn a tool result into compact text for the LLM prompt"""
+    if not isinstance(result, dict):
+        return compact_value(result) if not isinstance(result, str) else result
+
+    if isinstance(result.get("results"), list):
+        rows = result["results"]
+        label = " ".join(str(result[key]) for key in ("collection", "operation") if result.get(key))
+        if not rows:
+            return f"{label}: no matching documents".strip()
+
+        table, shown = render_table(rows, token_budget)
+        lines = [f"{label}: {len(rows)} rows".strip(), table]
+        if shown < len(rows):
+            lines.append(f"…and {len(rows) - shown} more")
+        if result.get("truncated"):
+            lines.append("(more documents match, narrow the query to see them)")
+        return "\n".join(lines)
+
+    if "result" in result and (isinstance(result["result"], dict) or result["result"] is None):
+        document = result["result"]
+        if document is None:
+            return "No matching document"
+        result = document
+
+    return "\n".join(f"{key}: {compact_value(value)}" for key, value in _clean(result).items())
+
+class CompactionStats:
+    """Running totals of prompt tokens saved by compacting tool output"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = 0
+        self._raw_tokens = 0
+        self._compact_tokens = 0
+
+    def record(self, raw_tokens: int, compact_tokens: int):
+        with self._lock:
+            self._calls += 1
+            self._raw_tokens += raw_tokens
+            self._compact_tokens += compact_tokens
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            saved = self._raw_tokens - self._compact_tokens
+            return {
+                "calls": self._calls,
+                "raw_tokens": self._raw_tokens,
+                "compact_tokens": self._compact_tokens,
+                "tokens_saved": saved,
+                "avg_tokens_saved": round(saved / self._calls, 1) if self._calls else 0.0
+            }
+
+
+compaction_stats = CompactionStats()
+
+def render_tool_result(tool: str, action: str, result: Any, token_budget: int) -> str:
+    """Compact a tool result and record how many tokens it saved"""
+    compact = compact_result(result, token_budget)
+    raw_tokens = estimate_tokens(str(result))
+    compact_tokens = estimate_tokens(compact)
+    compaction_stats.record(raw_tokens, compact_tokens)
+    logging.info(f"{tool} {action}: {raw_tokens} -> {compact_tokens} tokens ({raw_tokens - compact_tokens} saved)")
+    return compact
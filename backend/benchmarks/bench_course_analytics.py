@@ -0,0 +1,118 @@
+"""
+Benchmark the course performance aggregation at order volume.
+
+Seeds a scratch database with courses and orders, then times the old
+$lookup/$map pipeline on courses against the $group-on-orders pipeline used
+by compute_course_analytics, and prints the new pipeline's query plan,
+which should be an index scan with no FETCH. At around a million orders
+the old pipeline usually fails outright, because every course document
+embeds its whole order array.
+
+Usage (from the backend directory, needs a running MongoDB):
+    python -m benchmarks.bench_course_analytics --orders 1000000 --courses 12
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.services.analytics import COURSE_PERFORMANCE_PIPELINE
+
+LOOKUP_PIPELINE = [
+    {"$lookup": {"from": "orders", "localField": "_id", "foreignField": "course_id", "as": "enrollments"}},
+    {
+        "$project": {
+            "name": 1,
+            "instructor": 1,
+            "enrollment_count": {"$size": "$enrollments"},
+            "total_revenue": {"$sum": {"$map": {"input": "$enrollments", "as": "order", "in": "$$order.final_amount"}}}
+        }
+    },
+    {"$sort": {"enrollment_count": -1}}
+]
+
+def seed(db, orders: int, courses: int, batch: int = 10000):
+    db.courses.drop()
+    db.orders.drop()
+    course_ids = db.courses.insert_many([
+        {"name": f"Course {i}", "instructor": f"Instructor {i % 4}", "status": "active"}
+        for i in range(courses)
+    ]).inserted_ids
+
+    started = time.perf_counter()
+    for offset in range(0, orders, batch):
+        db.orders.insert_many([
+            {
+                "order_number": f"ORD-{offset + i + 1:07d}",
+                "client_id": ObjectId(),
+                "course_id": random.choice(course_ids),
+                "final_amount": random.choice((1500, 2500, 4000, 6000)),
+                "status": "paid"
+            }
+            for i in range(min(batch, orders - offset))
+        ], ordered=False)
+    db.orders.create_index([("course_id", 1), ("final_amount", 1)])
+    print(f"Seeded {orders:,} orders over {courses} courses in {time.perf_counter() - started:.1f}s")
+
+def plan_stages(plan):
+    """Stage names of an explain output, e.g. PROJECTION_COVERED, IXSCAN"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key, value in plan.items():
+            if key not in ("rejectedPlans", "executionStats"):
+                stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(plan_stages(item))
+    return stages
+
+def timed(label, run, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            run()
+        except PyMongoError as e:
+            print(f"{label:<28} failed: {str(e).splitlines()[0][:120]}")
+            return None
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<28} mean {statistics.mean(samples):10.1f} ms   min {min(samples):10.1f} ms")
+    return statistics.mean(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=1_000_000)
+    parser.add_argument("--courses", type=int, default=12)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--database", default="bench_course_analytics")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database afterwards")
+    args = parser.parse_args()
+
+    client = MongoClient(settings.MONGODB_URL)
+    db = client[args.database]
+    try:
+        seed(db, args.orders, args.courses)
+
+        explain = db.command("aggregate", "orders", pipeline=COURSE_PERFORMANCE_PIPELINE, explain=True)
+        print(f"$group on orders plan: {' <- '.join(plan_stages(explain)) or 'unknown'}")
+
+        old = timed("$lookup + $map on courses", lambda: list(db.courses.aggregate(LOOKUP_PIPELINE, allowDiskUse=True)), args.repeats)
+        new = timed("$group on orders", lambda: list(db.orders.aggregate(COURSE_PERFORMANCE_PIPELINE)), args.repeats)
+
+        if old and new:
+            print(f"Speedup: {old / new:.1f}x")
+    finally:
+        if not args.keep:
+            client.drop_database(args.database)
+        client.close()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,74 @@
+"""
+Benchmark per-request crew setup overhead.
+
+Compares the old per-request setup (a fresh Task and Crew around the shared
+agent, or a whole new Agent for streamed runs) with checking a pre-built crew
+out of the CrewTemplatePool and interpolating the request inputs.
+No LLM calls are made, only object construction is timed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_crew_setup --requests 500
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from crewai import Crew
+from app.agents.dashboard_agent import DashboardAgent
+
+QUERY = "Show me the top 5 clients by revenue contribution"
+CONTEXT = {"period": "last_30_days"}
+
+def timed(label, func, requests):
+    samples = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(
+        f"{label:<38} mean {statistics.mean(samples):8.3f} ms   "
+        f"p50 {samples[len(samples) // 2]:8.3f} ms   p95 {samples[int(len(samples) * 0.95) - 1]:8.3f} ms"
+    )
+    return statistics.mean(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    agent = DashboardAgent()
+    shared_agent = agent._build_agent()
+    inputs = {"query": QUERY, "context": json.dumps(CONTEXT)}
+
+    def fresh_task_and_crew():
+        task = agent._build_task(shared_agent)
+        crew = Crew(agents=[shared_agent], tasks=[task], verbose=True)
+        crew._interpolate_inputs(inputs)
+
+    def fresh_agent_task_and_crew():
+        new_agent = agent._build_agent()
+        task = agent._build_task(new_agent)
+        crew = Crew(agents=[new_agent], tasks=[task], verbose=True)
+        crew._interpolate_inputs(inputs)
+
+    def pooled_checkout():
+        with agent.crew_pool.checkout() as pooled:
+            pooled.crew._interpolate_inputs(inputs)
+
+    print(f"Per-request crew setup over {args.requests} requests\n")
+    before = timed("before: new Task + Crew", fresh_task_and_crew, args.requests)
+    before_stream = timed("before: new Agent + Task + Crew", fresh_agent_task_and_crew, args.requests)
+    after = timed("after: pooled checkout + interpolate", pooled_checkout, args.requests)
+
+    print(f"\nSpeedup vs new Task + Crew:         {before / after:6.1f}x")
+    print(f"Speedup vs new Agent + Task + Crew: {before_stream / after:6.1f}x")
+    print(f"Pool: {agent.crew_pool.get_metrics()}")
+
+if __name__ == "__main__":
+    main()
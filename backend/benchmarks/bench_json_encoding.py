@@ -0,0 +1,83 @@
+"""
+Microbenchmark JSON serialization of Mongo documents.
+
+Encodes a page of order-shaped documents (ObjectIds, datetimes, nested
+metadata) with FastAPI's jsonable_encoder + json.dumps, the default path for
+routes that return dicts, and with the orjson encoder behind
+MongoJSONResponse. No database is needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_json_encoding --rows 1000 --repeats 50
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.core.responses import dumps
+
+def make_orders(rows: int):
+    now = datetime.utcnow()
+    return [
+        {
+            "_id": ObjectId(),
+            "order_number": f"ORD-{i + 1:06d}",
+            "client_id": ObjectId(),
+            "course_id": ObjectId(),
+            "service_name": random.choice(("Yoga Basics", "HIIT", "Pilates Core")),
+            "amount": 2500.0,
+            "discount_applied": 250.0,
+            "final_amount": 2250.0,
+            "currency": "INR",
+            "status": "confirmed",
+            "payment_status": "paid",
+            "notes": "Paid at the front desk",
+            "metadata": {"source": "walk_in", "tags": ["morning", "trial"]},
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now
+        }
+        for i in range(rows)
+    ]
+
+def fastapi_default(page):
+    return json.dumps(jsonable_encoder(page, custom_encoder={ObjectId: str})).encode()
+
+def timed(label, encode, page, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        body = encode(page)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    encode(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{label:<34} mean {statistics.mean(samples):8.2f} ms   "
+        f"min {min(samples):8.2f} ms   peak alloc {peak / 1024:8.0f} KiB   body {len(body) / 1024:6.0f} KiB"
+    )
+    return statistics.mean(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    page = {"orders": make_orders(args.rows), "total": args.rows, "skip": 0, "limit": args.rows, "next_cursor": None}
+
+    old = timed("jsonable_encoder + json.dumps", fastapi_default, page, args.repeats)
+    new = timed("orjson (MongoJSONResponse)", dumps, page, args.repeats)
+    print(f"Speedup: {old / new:.1f}x")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Concurrency check for order number allocation.
+
+Creates hundreds of orders in parallel against a scratch database. The
+callers are split across two event loops in separate threads (like the API
+loop and the tool loop bridge) and two allocators (like two API workers).
+Every order must get a distinct number and the unique index must never
+fire. For comparison, the old count_documents() scheme is run the same way.
+
+Usage (from the backend directory, needs a running MongoDB):
+    python -m benchmarks.check_order_numbers --orders 500
+"""
+
+import argparse
+import asyncio
+import threading
+import time
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import DuplicateKeyError
+
+from app.core.config import settings
+from app.core.sequences import SequenceAllocator, _highest_order_number
+
+async def create_orders(database: str, count: int, allocate, results: list):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[database]
+
+    async def create():
+        number = await allocate(db)
+        try:
+            await db.orders.insert_one({"order_number": number, "status": "pending"})
+            results.append(number)
+        except DuplicateKeyError:
+            results.append(None)
+
+    try:
+        await asyncio.gather(*(create() for _ in range(count)))
+    finally:
+        client.close()
+
+def run_scheme(label: str, database: str, orders: int, allocators):
+    results = []
+    threads = [
+        threading.Thread(
+            target=asyncio.run,
+            args=(create_orders(database, orders // len(allocators), allocate, results),)
+        )
+        for allocate in allocators
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    created = [number for number in results if number is not None]
+    duplicates = len(results) - len(created)
+    print(
+        f"{label:<22} {len(results)} orders in {elapsed:6.2f}s   "
+        f"unique {len(set(created))}   rejected as duplicates {duplicates}"
+    )
+    return duplicates == 0 and len(set(created)) == len(results)
+
+async def reset(database: str, existing: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db = client[database]
+    await client.drop_database(database)
+    await db.orders.create_index("order_number", unique=True)
+    if existing:
+        await db.orders.insert_many([{"order_number": f"ORD-{i + 1:06d}"} for i in range(existing)])
+    client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--orders", type=int, default=500)
+    parser.add_argument("--existing", type=int, default=100, help="orders already in the collection")
+    parser.add_argument("--database", default="bench_order_numbers")
+    args = parser.parse_args()
+
+    asyncio.run(reset(args.database, args.existing))
+
+    async def count_based(db):
+        return f"ORD-{await db.orders.count_documents({}) + 1:06d}"
+
+    run_scheme("count_documents()", args.database, args.orders, [count_based, count_based])
+
+    asyncio.run(reset(args.database, args.existing))
+
+    workers = [
+        SequenceAllocator("order_number", settings.ORDER_NUMBER_BLOCK_SIZE, seed=_highest_order_number)
+        for _ in range(2)
+    ]
+
+    async def from_worker_a(db):
+        return f"ORD-{await workers[0].allocate(db):06d}"
+
+    async def from_worker_b(db):
+        return f"ORD-{await workers[1].allocate(db):06d}"
+
+    ok = run_scheme("block allocator", args.database, args.orders, [from_worker_a, from_worker_a, from_worker_b])
+    for i, worker in enumerate(workers):
+        print(f"  worker {i}: {worker.get_metrics()}")
+
+    asyncio.run(AsyncIOMotorClient(settings.MONGODB_URL).drop_database(args.database))
+    print("PASS" if ok else "FAIL")
+    raise SystemExit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
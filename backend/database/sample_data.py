@@ -9,6 +9,11 @@ import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
 import random
 import os
+import sys
+
+# Share the client search normalization with the API, whichever directory this runs from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.services.client_search import with_search_fields
 
 # Database connection
 # added a env URL to deploy it...
@@ -89,7 +94,8 @@ async def populate_sample_data():
         }
     ]
     
-    client_result = await db.clients.insert_many(clients_data)
+    # /clients/search and the agent lookups query the normalized search fields
+    client_result = await db.clients.insert_many([with_search_fields(client) for client in clients_data])
     client_ids = client_result.inserted_ids
     print(f"Inserted {len(client_ids)} clients")
     
@@ -34,7 +34,7 @@ export function ClientManagement() {
   const [selectedClient, setSelectedClient] = useState<Client | null>(null);
 
   const { data: clientsData, loading, error, refetch } = useApi(
-    () => clientService.getClients(0, 100, statusFilter === 'all' ? undefined : statusFilter),
+    () => clientService.getClients(0, 100, statusFilter === 'all' ? undefined : statusFilter, undefined, 'summary'),
     [statusFilter]
   );
 
@@ -64,7 +64,7 @@ export function Dashboard() {
   );
 
   const { data: ordersData, loading: ordersLoading, refetch: refetchOrders } = useApi(
-    () => orderService.getOrders(0, 10),
+    () => orderService.getOrders(0, 10, undefined, undefined, 'summary'),
     []
   );
 
@@ -37,6 +37,7 @@ export function DashboardAgent() {
   ]);
   const [inputText, setInputText] = useState('');
   const [isTyping, setIsTyping] = useState(false);
+  const [progress, setProgress] = useState<string | null>(null);
   const [showSidebar, setShowSidebar] = useState(false);
 
   const revenueData = [
@@ -85,7 +86,11 @@ export function DashboardAgent() {
     setIsTyping(true);
 
     try {
-      const response = await agentService.queryDashboardAgent(currentQuery);
+      const final = await agentService.streamAgentQuery('dashboard', currentQuery, (event, data) => {
+        if (event === 'tool') setProgress(`Using ${data.tool}...`);
+        else if (event === 'step' && data.thought) setProgress(data.thought);
+      });
+      const response = final?.data || {};
       
       const agentMessage: Message = {
         id: messages.length + 2,
@@ -105,6 +110,7 @@ export function DashboardAgent() {
       setMessages(prev => [...prev, errorMessage]);
     } finally {
       setIsTyping(false);
+      setProgress(null);
     }
   };
 
@@ -223,6 +229,7 @@ export function DashboardAgent() {
                       <div className="w-2 h-2 bg-purple-400 rounded-full animate-bounce" style={{ animationDelay: '0.1s' }} />
                       <div className="w-2 h-2 bg-indigo-400 rounded-full animate-bounce" style={{ animationDelay: '0.2s' }} />
                     </div>
+                    {progress && <span className="text-xs text-slate-300 font-medium truncate">{progress}</span>}
                   </div>
                 </div>
               </div>
@@ -36,7 +36,7 @@ export function OrderManagement() {
   const [paymentFilter, setPaymentFilter] = useState('all');
 
   const { data: ordersData, loading, error, refetch } = useApi(
-    () => orderService.getOrders(0, 100, statusFilter === 'all' ? undefined : statusFilter),
+    () => orderService.getOrders(0, 100, statusFilter === 'all' ? undefined : statusFilter, undefined, 'summary'),
     [statusFilter]
   );
 
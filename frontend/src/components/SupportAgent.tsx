@@ -33,6 +33,7 @@ export function SupportAgent() {
   ]);
   const [inputText, setInputText] = useState('');
   const [isTyping, setIsTyping] = useState(false);
+  const [progress, setProgress] = useState<string | null>(null);
   const [showSidebar, setShowSidebar] = useState(false);
 
   const sampleQueries = [
@@ -60,7 +61,11 @@ export function SupportAgent() {
     setIsTyping(true);
 
     try {
-      const response = await agentService.querySupportAgent(currentQuery);
+      const final = await agentService.streamAgentQuery('support', currentQuery, (event, data) => {
+        if (event === 'tool') setProgress(`Using ${data.tool}...`);
+        else if (event === 'step' && data.thought) setProgress(data.thought);
+      });
+      const response = final?.data || {};
       
       const agentMessage: Message = {
         id: messages.length + 2,
@@ -80,6 +85,7 @@ export function SupportAgent() {
       setMessages(prev => [...prev, errorMessage]);
     } finally {
       setIsTyping(false);
+      setProgress(null);
     }
   };
 
@@ -177,7 +183,7 @@ export function SupportAgent() {
                         <div className="w-2 h-2 bg-teal-400 rounded-full animate-bounce" style={{ animationDelay: '0.1s' }} />
                         <div className="w-2 h-2 bg-cyan-400 rounded-full animate-bounce" style={{ animationDelay: '0.2s' }} />
                       </div>
-                      <span className="text-sm text-slate-300 font-medium">AI is thinking...</span>
+                      <span className="text-sm text-slate-300 font-medium">{progress || 'AI is thinking...'}</span>
                     </div>
                   </div>
                 </div>
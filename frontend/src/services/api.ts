@@ -21,6 +21,53 @@ export const agentService = {
     return response.data;
   },
 
+  // Streams agent progress over Server-Sent Events and resolves with the final event
+  streamAgentQuery: async (
+    agent: 'support' | 'dashboard',
+    query: string,
+    onEvent: (event: string, data: any) => void,
+    context?: Record<string, unknown>
+  ) => {
+    const response = await fetch(`${API_BASE_URL}/agents/${agent}/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+      body: JSON.stringify({ query, context }),
+    });
+    if (!response.ok || !response.body) {
+      throw new Error(`Agent stream failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let last: { event: string; data: any } | null = null;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const chunk = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+
+        let event = 'message';
+        let data = '';
+        for (const line of chunk.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        }
+        if (!data) continue;
+
+        last = { event, data: JSON.parse(data) };
+        onEvent(last.event, last.data);
+      }
+    }
+
+    return last;
+  },
+
   getAgentStatus: async () => {
     const response = await api.get('/agents/status');
     return response.data;
@@ -29,13 +76,23 @@ export const agentService = {
 
 // Client Services
 export const clientService = {
-  getClients: async (skip = 0, limit = 100, status?: string) => {
+  // Pass the previous page's next_cursor to fetch the following page; fields is a preset ('summary') or a comma list
+  getClients: async (skip = 0, limit = 100, status?: string, cursor?: string, fields?: string) => {
     const params = new URLSearchParams({ skip: skip.toString(), limit: limit.toString() });
     if (status) params.append('status', status);
+    if (cursor) params.append('cursor', cursor);
+    if (fields) params.append('fields', fields);
     const response = await api.get(`/clients?${params}`);
     return response.data;
   },
 
+  // Partial name, email prefix or phone digits
+  searchClients: async (q: string, limit = 20) => {
+    const params = new URLSearchParams({ q, limit: limit.toString() });
+    const response = await api.get(`/clients/search?${params}`);
+    return response.data;
+  },
+
   createClient: async (clientData: any) => {
     const response = await api.post('/clients', clientData);
     return response.data;
@@ -45,13 +102,29 @@ export const clientService = {
     const response = await api.get(`/clients/${clientId}`);
     return response.data;
   },
+
+  // "Load more" for the client detail page, using orders_next_cursor / payments_next_cursor
+  getClientOrders: async (clientId: string, cursor: string, limit = 20) => {
+    const params = new URLSearchParams({ cursor, limit: limit.toString() });
+    const response = await api.get(`/clients/${clientId}/orders?${params}`);
+    return response.data;
+  },
+
+  getClientPayments: async (clientId: string, cursor: string, limit = 20) => {
+    const params = new URLSearchParams({ cursor, limit: limit.toString() });
+    const response = await api.get(`/clients/${clientId}/payments?${params}`);
+    return response.data;
+  },
 };
 
 // Order Services
 export const orderService = {
-  getOrders: async (skip = 0, limit = 100, status?: string) => {
+  // Pass the previous page's next_cursor to fetch the following page; fields is a preset ('summary') or a comma list
+  getOrders: async (skip = 0, limit = 100, status?: string, cursor?: string, fields?: string) => {
     const params = new URLSearchParams({ skip: skip.toString(), limit: limit.toString() });
     if (status) params.append('status', status);
+    if (cursor) params.append('cursor', cursor);
+    if (fields) params.append('fields', fields);
     const response = await api.get(`/orders?${params}`);
     return response.data;
   },